@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from analyzer import ANALYZER_VERSION, SCORE_FIELDS, ListingScores
+from update_categories import CATEGORY_VERSION
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'analysis_cache.db')
+
+class CachedAnalysis(NamedTuple):
+    """Scores and category stored for one listing content"""
+    scores: ListingScores
+    category: Optional[str]
+
+class AnalysisCache:
+    """
+    Disk-backed memoization of analysis results, kept in its own SQLite file.
+
+    Entries are keyed by a listing's content hash together with the analyzer
+    and category rule versions, so a rules change simply stops old entries from
+    matching and they age out. The cache holds at most max_entries results and
+    evicts the least recently used ones when it grows beyond that. Hits and
+    misses are counted for the lifetime of the object.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=100000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # The crawl pipeline analyzes listings in worker threads
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # A cache can afford to lose its last writes on a crash
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        score_columns = ", ".join(f"{field} REAL" for field in SCORE_FIELDS)
+        with self.conn:
+            self.conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    {score_columns},
+                    category TEXT,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS ix_analysis_cache_last_used ON analysis_cache (last_used)")
+        self._size = self.conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+    @staticmethod
+    def _key(content_hash):
+        versioned = f"{content_hash}:{ANALYZER_VERSION}:{CATEGORY_VERSION}"
+        return hashlib.sha1(versioned.encode('utf-8')).hexdigest()
+
+    def get(self, content_hash):
+        """Return the CachedAnalysis for a listing_hash(), or None on a miss"""
+        return self.get_many([content_hash]).get(content_hash)
+
+    def get_many(self, content_hashes):
+        """
+        Look up many listing hashes at once
+
+        Returns:
+            dict: content hash -> CachedAnalysis for the hashes that were found
+        """
+        keys = {self._key(content_hash): content_hash for content_hash in content_hashes}
+        found = {}
+        key_list = list(keys)
+        with self._lock:
+            # Stay below SQLite's default limit of bound parameters
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for key, *values in self.conn.execute(
+                    f"SELECT key, {', '.join(SCORE_FIELDS)}, category FROM analysis_cache WHERE key IN ({placeholders})",
+                    chunk
+                ):
+                    found[keys[key]] = CachedAnalysis(ListingScores(*values[:-1]), values[-1])
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            if found:
+                now = time.time()
+                with self.conn:
+                    self.conn.executemany(
+                        "UPDATE analysis_cache SET last_used = ? WHERE key = ?",
+                        [(now, self._key(content_hash)) for content_hash in found]
+                    )
+        return found
+
+    def put(self, content_hash, scores, category=None):
+        """Store the scores (and category, if known) of a listing_hash()"""
+        self.put_many([(content_hash, scores, category)])
+
+    def put_many(self, entries):
+        """Store many (content_hash, scores, category) results in one transaction"""
+        now = time.time()
+        rows = [(self._key(content_hash), *scores, category, now) for content_hash, scores, category in entries]
+        placeholders = ", ".join("?" * (len(SCORE_FIELDS) + 3))
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(f"INSERT OR REPLACE INTO analysis_cache VALUES ({placeholders})", rows)
+            self._size += len(rows)
+            if self._size > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        """
+        Drop the least recently used entries once the cache is over max_entries
+
+        Evicts down to 90% of max_entries so eviction does not run on every put.
+        """
+        with self.conn:
+            size = self.conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+            excess = size - int(self.max_entries * 0.9) if size > self.max_entries else 0
+            if excess > 0:
+                self.conn.execute(
+                    "DELETE FROM analysis_cache WHERE key IN "
+                    "(SELECT key FROM analysis_cache ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                )
+                logging.info(f"Evicted {excess} least recently used analysis cache entries")
+        self._size = size - excess
+
+    def stats(self):
+        """Hit/miss counts of this cache object and the number of stored entries"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': self._size,
+        }
+
+    def log_stats(self):
+        """Log the stats() of this cache"""
+        stats = self.stats()
+        logging.info(f"Analysis cache: {stats['hits']} hits, {stats['misses']} misses "
+                     f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} entries")
+
+    def close(self):
+        """Close the cache database"""
+        self.conn.close()
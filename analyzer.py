@@ -1,4 +1,95 @@
+import hashlib
 import re
+from collections import Counter
+from typing import NamedTuple
+
+class KeywordMatcher:
+    r"""
+    A keyword list compiled once at import and matched against a text in one pass.
+
+    With word_prefix=True a keyword matches at the start of a word and may run on
+    to the end of it (the r'\bkeyword\w*\b' rule), ignoring hyphens. All keywords
+    are folded into one lookahead alternation, longest first, so every word start
+    is tested once; shorter keywords that are prefixes of the hit count with it.
+
+    Otherwise keywords match anywhere as plain substrings, like `kw in text`. For
+    lists this short CPython's substring search beats a combined regex, so that
+    mode only deduplicates the list.
+    """
+
+    def __init__(self, keywords, word_prefix=False):
+        self.word_prefix = word_prefix
+        if word_prefix:
+            keywords = [kw.replace('-', '') for kw in keywords]
+        self.weights = Counter(keywords)
+        self.keywords = tuple(self.weights)
+        self._pattern = None
+        self._implied = {}
+        if word_prefix:
+            longest_first = sorted(self.keywords, key=len, reverse=True)
+            alternation = '|'.join(re.escape(kw) for kw in longest_first)
+            self._pattern = re.compile(r'\b(?=(' + alternation + r'))')
+            self._implied = {
+                kw: [other for other in self.keywords if kw.startswith(other)]
+                for kw in self.keywords
+            }
+
+    def counts(self, text):
+        """Return a Counter of keyword -> number of matches in the (lowercased) text"""
+        counts = Counter()
+        if self.word_prefix:
+            for match in self._pattern.finditer(text.replace('-', '')):
+                for kw in self._implied[match.group(1)]:
+                    counts[kw] += 1
+        else:
+            for kw in self.keywords:
+                found = text.count(kw)
+                if found:
+                    counts[kw] = found
+        return counts
+
+    def total(self, text):
+        """Total number of keyword matches, weighted by how often each keyword is listed"""
+        return self.tally(self.counts(text))
+
+    def tally(self, counts):
+        """Weighted total of counts taken by this or any wider matcher over the same text"""
+        return sum(weight * counts[kw] for kw, weight in self.weights.items())
+
+    def matched(self, text):
+        """Keywords that occur in the text at least once"""
+        if self.word_prefix:
+            return list(self.counts(text))
+        return [kw for kw in self.keywords if kw in text]
+
+    def present(self, text):
+        """Number of listed keywords that occur in the text at least once"""
+        return sum(self.weights[kw] for kw in self.matched(text))
+
+# Team-related keywords (in Latvian and English)
+TEAM_KEYWORDS = [
+    'team', 'komanda', 'komandā', 'kolektīvs', 'kolektīvā',
+    'sadarbība', 'sadarboties', 'collaborate', 'collaboration',
+    'grupa', 'grupā', 'koordinēt', 'koordinācija',
+    'lead', 'vadīt', 'vadītājs', 'menedžer', 'pārvaldīt',
+    'partneri', 'kolēģi', 'colleagues', 'meetings', 'sapulces',
+    'pievienojies mūsu komandai', 'join our team', 'komandas darbs',
+    'apspriedes', 'sapulces', 'prezentācijas', 'presentations',
+    'koordinēšana', 'coordination', 'projektu vadība', 'project management'
+]
+
+# Individual work keywords
+INDIVIDUAL_KEYWORDS = [
+    'independent', 'neatkarīgi', 'patstāvīgi', 'autonoms',
+    'pašmotivēts', 'self-motivated', 'self-directed',
+    'individual', 'individuāls', 'remote', 'attālināti',
+    'specializēts', 'specialized', 'expert', 'eksperts',
+    'autonomi', 'autonomia', 'neatkarība', 'independence',
+    'patstāvīgs darbs', 'individual work', 'strādāt patstāvīgi'
+]
+
+_TEAM_MATCHER = KeywordMatcher(TEAM_KEYWORDS, word_prefix=True)
+_INDIVIDUAL_MATCHER = KeywordMatcher(INDIVIDUAL_KEYWORDS, word_prefix=True)
 
 def analyze_teamwork_preference(title, description, requirements, responsibilities):
     """
@@ -16,46 +107,20 @@ def analyze_teamwork_preference(title, description, requirements, responsibiliti
     
     # Combine all text for analysis
     full_text = f"{title} {description} {requirements} {responsibilities}".lower()
-    
-    # Team-related keywords (in Latvian and English)
-    team_keywords = [
-        'team', 'komanda', 'komandā', 'kolektīvs', 'kolektīvā',
-        'sadarbība', 'sadarboties', 'collaborate', 'collaboration',
-        'grupa', 'grupā', 'koordinēt', 'koordinācija',
-        'lead', 'vadīt', 'vadītājs', 'menedžer', 'pārvaldīt',
-        'partneri', 'kolēģi', 'colleagues', 'meetings', 'sapulces',
-        'pievienojies mūsu komandai', 'join our team', 'komandas darbs',
-        'apspriedes', 'sapulces', 'prezentācijas', 'presentations',
-        'koordinēšana', 'coordination', 'projektu vadība', 'project management'
-    ]
-    
-    # Individual work keywords
-    individual_keywords = [
-        'independent', 'neatkarīgi', 'patstāvīgi', 'autonoms',
-        'pašmotivēts', 'self-motivated', 'self-directed',
-        'individual', 'individuāls', 'remote', 'attālināti',
-        'specializēts', 'specialized', 'expert', 'eksperts',
-        'autonomi', 'autonomia', 'neatkarība', 'independence',
-        'patstāvīgs darbs', 'individual work', 'strādāt patstāvīgi'
-    ]
-    
-    # Count keyword occurrences with word boundary matching to avoid partial matches
-    team_count = sum(len(re.findall(r'\b' + re.escape(kw.replace('-', '')) + r'\w*\b', 
-                                    full_text.replace('-', ''))) for kw in team_keywords)
-    
-    individual_count = sum(len(re.findall(r'\b' + re.escape(kw.replace('-', '')) + r'\w*\b', 
-                                         full_text.replace('-', ''))) for kw in individual_keywords)
-    
-    # Additional analysis based on typical job characteristics
+    return _score_teamwork(title.lower(), full_text, _WORD_PREFIX_MATCHER.counts(full_text))
+
+def _teamwork_adjustment(title, full_text):
+    """Extra team points from the title, customer service and team size mentions"""
+    team_bonus = 0
     
     # Check for leadership/management roles
     leadership_terms = ['vadītājs', 'manager', 'lead', 'head', 'director', 'chief']
-    if any(term in title.lower() for term in leadership_terms):
-        team_count += 3
+    if any(term in title for term in leadership_terms):
+        team_bonus += 3
     
     # Customer service roles typically involve team interaction
     if 'klientu apkalpošana' in full_text or 'customer service' in full_text:
-        team_count += 2
+        team_bonus += 2
     
     # Check for team size mentions
     team_size_patterns = [
@@ -70,10 +135,22 @@ def analyze_teamwork_preference(title, description, requirements, responsibiliti
             try:
                 size = int(team_size_match.group(1))
                 if size > 1:
-                    team_count += 1
+                    team_bonus += 1
             except:
                 pass
     
+    return team_bonus
+
+def _score_teamwork(title, full_text, word_counts):
+    """Teamwork score from an already lowercased title and text"""
+    # Count keyword occurrences with word boundary matching to avoid partial matches
+    team_count = _TEAM_MATCHER.tally(word_counts)
+    
+    individual_count = _INDIVIDUAL_MATCHER.tally(word_counts)
+    
+    # Additional analysis based on typical job characteristics
+    team_count += _teamwork_adjustment(title, full_text)
+    
     # If no keywords found or equal counts, use a more neutral value but slightly biased toward team work
     # since most jobs involve some degree of collaboration
     if team_count + individual_count == 0:
@@ -82,6 +159,31 @@ def analyze_teamwork_preference(title, description, requirements, responsibiliti
     # Calculate likelihood score (0 to 1)
     return team_count / (team_count + individual_count)
 
+# Learning opportunity keywords
+LEARNING_KEYWORDS = [
+    'learning', 'growth', 'development', 'training', 'mentor', 'education',
+    'mācīties', 'mācības', 'apmācība', 'attīstība', 'izaugsme', 'kursi',
+    'sertifikācija', 'certification', 'improve', 'pilnveidot', 'apgūt',
+    'profesionālā izaugsme', 'professional growth', 'skills', 'prasmes',
+    'paplašināt zināšanas', 'knowledge', 'zināšanas', 'kompetences',
+    'jauna tehnoloģija', 'new technology', 'innovation', 'inovācija'
+]
+
+# Low learning opportunity keywords
+STATIC_KEYWORDS = [
+    'routine', 'rutīna', 'repetitive', 'atkārtojošs', 'standarta',
+    'basic', 'pamata', 'vienkāršs', 'simple', 'monotonous', 'monotons'
+]
+
+_LEARNING_MATCHER = KeywordMatcher(LEARNING_KEYWORDS, word_prefix=True)
+_STATIC_MATCHER = KeywordMatcher(STATIC_KEYWORDS, word_prefix=True)
+
+# Teamwork and learning share one scan over the same text
+_WORD_PREFIX_MATCHER = KeywordMatcher(
+    TEAM_KEYWORDS + INDIVIDUAL_KEYWORDS + LEARNING_KEYWORDS + STATIC_KEYWORDS,
+    word_prefix=True
+)
+
 def analyze_learning_opportunity(title, description, requirements, responsibilities):
     """
     Analyze how much learning opportunity a job offers.
@@ -98,41 +200,35 @@ def analyze_learning_opportunity(title, description, requirements, responsibilit
     
     # Combine all text for analysis
     full_text = f"{title} {description} {requirements} {responsibilities}".lower()
-    
-    # Learning opportunity keywords
-    learning_keywords = [
-        'learning', 'growth', 'development', 'training', 'mentor', 'education',
-        'mācīties', 'mācības', 'apmācība', 'attīstība', 'izaugsme', 'kursi',
-        'sertifikācija', 'certification', 'improve', 'pilnveidot', 'apgūt',
-        'profesionālā izaugsme', 'professional growth', 'skills', 'prasmes',
-        'paplašināt zināšanas', 'knowledge', 'zināšanas', 'kompetences',
-        'jauna tehnoloģija', 'new technology', 'innovation', 'inovācija'
-    ]
-    
-    # Low learning opportunity keywords
-    static_keywords = [
-        'routine', 'rutīna', 'repetitive', 'atkārtojošs', 'standarta',
-        'basic', 'pamata', 'vienkāršs', 'simple', 'monotonous', 'monotons'
-    ]
-    
-    # Count keyword occurrences
-    learning_count = sum(len(re.findall(r'\b' + re.escape(kw.replace('-', '')) + r'\w*\b', 
-                                       full_text.replace('-', ''))) for kw in learning_keywords)
-    
-    static_count = sum(len(re.findall(r'\b' + re.escape(kw.replace('-', '')) + r'\w*\b', 
-                                     full_text.replace('-', ''))) for kw in static_keywords)
+    return _score_learning(title.lower(), full_text, _WORD_PREFIX_MATCHER.counts(full_text))
+
+def _learning_adjustments(title, full_text):
+    """Extra (learning, static) points from education benefits and seniority"""
+    learning_bonus = 0
+    static_bonus = 0
     
     # Check for educational benefits
     if re.search(r'(apmaksā|apmaksāt|cover|pay for).{1,30}(courses|kursi|education|izglītība|studies|training)', full_text):
-        learning_count += 3
+        learning_bonus += 3
         
     # If entry level position, likely more to learn
     if re.search(r'(entry.?level|junior|iesācēj|jaunāk)', full_text):
-        learning_count += 2
+        learning_bonus += 2
     
     # If senior/lead position, might focus more on applying existing skills
-    if re.search(r'(senior|vecāk|lead|vadoš)', title.lower()):
-        static_count += 1
+    if re.search(r'(senior|vecāk|lead|vadoš)', title):
+        static_bonus += 1
+    
+    return learning_bonus, static_bonus
+
+def _score_learning(title, full_text, word_counts):
+    """Learning opportunity score from an already lowercased title and text"""
+    learning_bonus, static_bonus = _learning_adjustments(title, full_text)
+    
+    # Count keyword occurrences
+    learning_count = _LEARNING_MATCHER.tally(word_counts) + learning_bonus
+    
+    static_count = _STATIC_MATCHER.tally(word_counts) + static_bonus
     
     # If no keywords found or equal counts, return a neutral value
     if learning_count + static_count == 0:
@@ -141,6 +237,23 @@ def analyze_learning_opportunity(title, description, requirements, responsibilit
     # Calculate score (0 to 1)
     return learning_count / (learning_count + static_count)
 
+# Keywords indicating company size
+LARGE_KEYWORDS = [
+    'corporation', 'korporācija', 'global', 'globāl', 'international', 
+    'starptautisk', 'nasdaq', 'enterprise', 'uzņēmumu grupa', 'group',
+    'tūkstošiem darbinieku', 'thousands of employees', 'liels uzņēmums',
+    'darbinieki visā pasaulē', 'employees worldwide', 'market leader',
+    'tirgus līderis', 'lielākais', 'largest', 'multinational', 'holding'
+]
+
+SMALL_KEYWORDS = [
+    'startup', 'jaunuzņēmums', 'small team', 'maza komanda', 'ģimenes uzņēmums',
+    'family business', 'boutique', 'niche', 'nišas', 'individuāl', 'mazs uzņēmums'
+]
+
+_LARGE_MATCHER = KeywordMatcher(LARGE_KEYWORDS)
+_SMALL_MATCHER = KeywordMatcher(SMALL_KEYWORDS)
+
 def analyze_company_size(company, description):
     """
     Estimate company size based on company name and description.
@@ -154,7 +267,13 @@ def analyze_company_size(company, description):
         description = ""
     
     text = f"{company} {description}".lower()
-    
+    return _score_company_size(company.lower(), text)
+
+def _company_size_adjustments(company, text):
+    """
+    Base size from the known large companies, plus the size implied by an
+    employee count mention (None if there is none)
+    """
     # Check for known large companies in Latvia
     large_companies = [
         'accenture', 'swedbank', 'seb', 'lattelecom', 'tet', 'citadele',
@@ -163,63 +282,77 @@ def analyze_company_size(company, description):
         'google', 'amazon', 'ibm', 'oracle', 'sap', 'tietoevry', 'visma'
     ]
     
-    # Keywords indicating company size
-    large_keywords = [
-        'corporation', 'korporācija', 'global', 'globāl', 'international', 
-        'starptautisk', 'nasdaq', 'enterprise', 'uzņēmumu grupa', 'group',
-        'tūkstošiem darbinieku', 'thousands of employees', 'liels uzņēmums',
-        'darbinieki visā pasaulē', 'employees worldwide', 'market leader',
-        'tirgus līderis', 'lielākais', 'largest', 'multinational', 'holding'
-    ]
-    
-    small_keywords = [
-        'startup', 'jaunuzņēmums', 'small team', 'maza komanda', 'ģimenes uzņēmums',
-        'family business', 'boutique', 'niche', 'nišas', 'individuāl', 'mazs uzņēmums'
-    ]
-    
     # Default medium-small size (0.4)
-    size_score = 0.4
+    base_score = 0.4
     
     # Check for large company indicators
-    if any(company.lower() == lc or company.lower().startswith(f"{lc} ") or 
-           company.lower().endswith(f" {lc}") or f" {lc} " in company.lower() 
+    if any(company == lc or company.startswith(f"{lc} ") or 
+           company.endswith(f" {lc}") or f" {lc} " in company 
            for lc in large_companies):
-        size_score = 0.9
-    
-    # Count size keywords
-    large_count = sum(1 for kw in large_keywords if kw in text)
-    small_count = sum(1 for kw in small_keywords if kw in text)
-    
-    # Adjust score based on keyword counts
-    if large_count > small_count:
-        size_score = min(size_score + 0.1 * (large_count - small_count), 1.0)
-    elif small_count > large_count:
-        size_score = max(size_score - 0.1 * (small_count - large_count), 0.0)
+        base_score = 0.9
     
     # Check for employee count mentions
+    employee_score = None
     employee_match = re.search(r'(\d+)[\s+]*(darbinieku|darbinieki|employees|staff)', text)
     if employee_match:
         try:
             count = int(employee_match.group(1))
             if count < 20:
-                size_score = 0.1
+                employee_score = 0.1
             elif count < 50:
-                size_score = 0.2
+                employee_score = 0.2
             elif count < 100:
-                size_score = 0.3
+                employee_score = 0.3
             elif count < 250:
-                size_score = 0.5
+                employee_score = 0.5
             elif count < 500:
-                size_score = 0.7
+                employee_score = 0.7
             elif count < 1000:
-                size_score = 0.8
+                employee_score = 0.8
             else:
-                size_score = 0.9
+                employee_score = 0.9
         except:
             pass
     
+    return base_score, employee_score
+
+def _score_company_size(company, text):
+    """Company size score from an already lowercased company name and text"""
+    size_score, employee_score = _company_size_adjustments(company, text)
+    
+    # Count size keywords
+    large_count = _LARGE_MATCHER.present(text)
+    small_count = _SMALL_MATCHER.present(text)
+    
+    # Adjust score based on keyword counts
+    if large_count > small_count:
+        size_score = min(size_score + 0.1 * (large_count - small_count), 1.0)
+    elif small_count > large_count:
+        size_score = max(size_score - 0.1 * (small_count - large_count), 0.0)
+    
+    # An explicit employee count wins over the keywords
+    if employee_score is not None:
+        size_score = employee_score
+    
     return size_score
 
+# Remote work keywords
+REMOTE_KEYWORDS = [
+    'remote', 'attālināti', 'work from home', 'strādāt no mājām',
+    'remote-first', 'hybrid', 'hibrīd', 'flexible location', 'elastīga darba vieta',
+    'home office', 'anywhere', 'jebkur', 'telecommute', 'virtual', 'virtuāl'
+]
+
+# On-site keywords
+ONSITE_KEYWORDS = [
+    'on-site', 'uz vietas', 'office', 'biroj', 'in person', 'klātienē',
+    'location', 'lokācij', 'on location', 'darba vietā', 'workplace',
+    'attend', 'present', 'klātbūtne'
+]
+
+_REMOTE_MATCHER = KeywordMatcher(REMOTE_KEYWORDS)
+_ONSITE_MATCHER = KeywordMatcher(ONSITE_KEYWORDS)
+
 def analyze_remote_preference(description, requirements):
     """
     Analyze how remote-friendly a job is.
@@ -233,21 +366,10 @@ def analyze_remote_preference(description, requirements):
         requirements = ""
     
     text = f"{description} {requirements}".lower()
-    
-    # Remote work keywords
-    remote_keywords = [
-        'remote', 'attālināti', 'work from home', 'strādāt no mājām',
-        'remote-first', 'hybrid', 'hibrīd', 'flexible location', 'elastīga darba vieta',
-        'home office', 'anywhere', 'jebkur', 'telecommute', 'virtual', 'virtuāl'
-    ]
-    
-    # On-site keywords
-    onsite_keywords = [
-        'on-site', 'uz vietas', 'office', 'biroj', 'in person', 'klātienē',
-        'location', 'lokācij', 'on location', 'darba vietā', 'workplace',
-        'attend', 'present', 'klātbūtne'
-    ]
-    
+    return _score_remote(text)
+
+def _remote_override(text):
+    """Fixed remote score for explicit remote/on-site/hybrid phrases, or None"""
     # Check for specific phrases
     if re.search(r'(fully|pilnībā|100%).{1,10}(remote|attālināti)', text):
         return 1.0
@@ -258,9 +380,17 @@ def analyze_remote_preference(description, requirements):
     if re.search(r'(hybrid|hibrīd).{1,20}(work|darb)', text):
         return 0.5
     
+    return None
+
+def _score_remote(text):
+    """Remote work score from an already lowercased text"""
+    override = _remote_override(text)
+    if override is not None:
+        return override
+    
     # Count keyword occurrences
-    remote_count = sum(1 for kw in remote_keywords if kw in text)
-    onsite_count = sum(1 for kw in onsite_keywords if kw in text)
+    remote_count = _REMOTE_MATCHER.present(text)
+    onsite_count = _ONSITE_MATCHER.present(text)
     
     # If no keywords found, assume moderate on-site preference (0.3)
     if remote_count + onsite_count == 0:
@@ -269,6 +399,23 @@ def analyze_remote_preference(description, requirements):
     # Calculate score (0 to 1)
     return remote_count / (remote_count + onsite_count)
 
+# Career growth keywords
+GROWTH_KEYWORDS = [
+    'career', 'karjera', 'promotion', 'paaugstināj', 'advancement', 'izaugsme',
+    'growth', 'progress', 'attīstība', 'development', 'mentorship', 'leadership',
+    'līderība', 'vadība', 'perspective', 'perspektīva', 'long-term', 'ilgtermiņa',
+    'career path', 'karjeras ceļš', 'advance', 'virzīties', 'climb', 'talent program'
+]
+
+# Limited growth keywords
+LIMITED_KEYWORDS = [
+    'temporary', 'īslaicīg', 'contract', 'līgumdarbs', 'seasonal', 'sezonas',
+    'project-based', 'projekta', 'short-term', 'īstermiņa', 'interim', 'pagaidu'
+]
+
+_GROWTH_MATCHER = KeywordMatcher(GROWTH_KEYWORDS)
+_LIMITED_MATCHER = KeywordMatcher(LIMITED_KEYWORDS)
+
 def analyze_career_growth(title, description, benefits):
     """
     Analyze career growth opportunities in the job.
@@ -284,40 +431,35 @@ def analyze_career_growth(title, description, benefits):
         benefits = ""
     
     text = f"{title} {description} {benefits}".lower()
-    
-    # Career growth keywords
-    growth_keywords = [
-        'career', 'karjera', 'promotion', 'paaugstināj', 'advancement', 'izaugsme',
-        'growth', 'progress', 'attīstība', 'development', 'mentorship', 'leadership',
-        'līderība', 'vadība', 'perspective', 'perspektīva', 'long-term', 'ilgtermiņa',
-        'career path', 'karjeras ceļš', 'advance', 'virzīties', 'climb', 'talent program'
-    ]
-    
-    # Limited growth keywords
-    limited_keywords = [
-        'temporary', 'īslaicīg', 'contract', 'līgumdarbs', 'seasonal', 'sezonas',
-        'project-based', 'projekta', 'short-term', 'īstermiņa', 'interim', 'pagaidu'
-    ]
-    
-    # Count keyword occurrences
-    growth_count = sum(1 for kw in growth_keywords if kw in text)
-    limited_count = sum(1 for kw in limited_keywords if kw in text)
+    return _score_career_growth(title.lower(), text)
+
+def _career_growth_adjustment(title, text):
+    """Extra growth points from the title, career paths and internal promotion"""
+    growth_bonus = 0
     
     # Management/leadership roles typically have growth paths
-    if re.search(r'(manag|vadītāj|vadīt|direct|vad|lead)', title.lower()):
-        growth_count += 2
+    if re.search(r'(manag|vadītāj|vadīt|direct|vad|lead)', title):
+        growth_bonus += 2
     
     # Entry level positions often have growth potential
-    if re.search(r'(trainee|praktikant|intern|stažier|junior|jaunāk)', title.lower()):
-        growth_count += 1
+    if re.search(r'(trainee|praktikant|intern|stažier|junior|jaunāk)', title):
+        growth_bonus += 1
     
     # If mentions specific career paths
     if re.search(r'(career|karjeras).{1,15}(path|ceļ|track)', text):
-        growth_count += 2
+        growth_bonus += 2
         
     # If promoting from within is mentioned
     if re.search(r'(promot|paaugstina|advance|virzī).{1,20}(within|inside|iekšēji|no iekšienes)', text):
-        growth_count += 3
+        growth_bonus += 3
+    
+    return growth_bonus
+
+def _score_career_growth(title, text):
+    """Career growth score from an already lowercased title and text"""
+    # Count keyword occurrences
+    growth_count = _GROWTH_MATCHER.present(text) + _career_growth_adjustment(title, text)
+    limited_count = _LIMITED_MATCHER.present(text)
     
     # If no keywords found, return moderate value
     if growth_count + limited_count == 0:
@@ -326,6 +468,25 @@ def analyze_career_growth(title, description, benefits):
     # Calculate score (0 to 1)
     return growth_count / (growth_count + limited_count)
 
+# Long-term project keywords
+LONG_TERM_KEYWORDS = [
+    'maintenance', 'uzturēšana', 'long-term', 'ilgtermiņa', 'stable',
+    'stabils', 'ongoing', 'nepārtraukts', 'legacy', 'established', 'iedibināts',
+    'support', 'atbalsts', 'sustain', 'uzturēt', 'continuous', 'nepārtraukta',
+    'operation', 'operatīv', 'year contract', 'gadu līgums', 'consistent'
+]
+
+# Short-term/innovative project keywords
+INNOVATIVE_KEYWORDS = [
+    'innovative', 'inovatīv', 'startup', 'jaunuzņēmum', 'prototype',
+    'prototip', 'pilot', 'experimental', 'eksperimentāl', 'proof of concept',
+    'mvp', 'agile', 'scrum', 'sprint', 'rapid', 'ātr', 'dynamic', 'dinamisk',
+    'creative', 'radoš', 'cutting-edge', 'jaunāk', 'groundbreaking', 'revolution'
+]
+
+_LONG_TERM_MATCHER = KeywordMatcher(LONG_TERM_KEYWORDS)
+_INNOVATIVE_MATCHER = KeywordMatcher(INNOVATIVE_KEYWORDS)
+
 def analyze_project_type(title, description, responsibilities):
     """
     Analyze what type of projects the job involves.
@@ -341,41 +502,37 @@ def analyze_project_type(title, description, responsibilities):
         responsibilities = ""
     
     text = f"{title} {description} {responsibilities}".lower()
-    
-    # Long-term project keywords
-    long_term_keywords = [
-        'maintenance', 'uzturēšana', 'long-term', 'ilgtermiņa', 'stable',
-        'stabils', 'ongoing', 'nepārtraukts', 'legacy', 'established', 'iedibināts',
-        'support', 'atbalsts', 'sustain', 'uzturēt', 'continuous', 'nepārtraukta',
-        'operation', 'operatīv', 'year contract', 'gadu līgums', 'consistent'
-    ]
-    
-    # Short-term/innovative project keywords
-    innovative_keywords = [
-        'innovative', 'inovatīv', 'startup', 'jaunuzņēmum', 'prototype',
-        'prototip', 'pilot', 'experimental', 'eksperimentāl', 'proof of concept',
-        'mvp', 'agile', 'scrum', 'sprint', 'rapid', 'ātr', 'dynamic', 'dinamisk',
-        'creative', 'radoš', 'cutting-edge', 'jaunāk', 'groundbreaking', 'revolution'
-    ]
-    
-    # Count keyword occurrences
-    long_term_count = sum(1 for kw in long_term_keywords if kw in text)
-    innovative_count = sum(1 for kw in innovative_keywords if kw in text)
+    return _score_project_type(title.lower(), text)
+
+def _project_type_adjustments(title, text):
+    """Extra (long-term, innovative) points from the title and duration mentions"""
+    long_term_bonus = 0
+    innovative_bonus = 0
     
     # Maintenance roles tend to be more stable/long-term
-    if re.search(r'(mainten|uzturēšan|support|atbalst)', title.lower()):
-        long_term_count += 2
+    if re.search(r'(mainten|uzturēšan|support|atbalst)', title):
+        long_term_bonus += 2
     
     # R&D roles tend to be more innovative/short-term
-    if re.search(r'(research|pētniec|develop|izstrād|innovat|inovāc)', title.lower()):
-        innovative_count += 2
+    if re.search(r'(research|pētniec|develop|izstrād|innovat|inovāc)', title):
+        innovative_bonus += 2
         
     # Check for project duration mentions
     if re.search(r'(short.?term|īstermiņa|quick|temporary|pagaidu)', text):
-        innovative_count += 1
+        innovative_bonus += 1
         
     if re.search(r'(long.?term|ilgtermiņa|multi.?year|vairāku gadu)', text):
-        long_term_count += 1
+        long_term_bonus += 1
+    
+    return long_term_bonus, innovative_bonus
+
+def _score_project_type(title, text):
+    """Project type score from an already lowercased title and text"""
+    long_term_bonus, innovative_bonus = _project_type_adjustments(title, text)
+    
+    # Count keyword occurrences
+    long_term_count = _LONG_TERM_MATCHER.present(text) + long_term_bonus
+    innovative_count = _INNOVATIVE_MATCHER.present(text) + innovative_bonus
     
     # If no keywords found, return moderate value
     if long_term_count + innovative_count == 0:
@@ -384,6 +541,33 @@ def analyze_project_type(title, description, responsibilities):
     # Calculate score (0 to 1)
     return innovative_count / (long_term_count + innovative_count)
 
+# Entry-level keywords
+ENTRY_KEYWORDS = [
+    'entry level', 'entry-level', 'junior', 'iesācēj', 'sākuma līmeņa', 
+    'no experience', 'bez pieredzes', 'graduate', 'absolvents', 'recent graduate',
+    'intern', 'internship', 'praktikants', 'prakse', 'trainee', 'māceklis',
+    'assistant', 'asistents'
+]
+
+# Mid-level keywords
+MID_KEYWORDS = [
+    'mid level', 'mid-level', 'vidēja līmeņa', 'intermediate', 'experienced', 
+    'at least 2 years', 'vismaz 2 gadi', '2+ years', '3+ years', '2-4 years',
+    'ar pieredzi', 'with experience', 'pieredze līdzīgā amatā'
+]
+
+# Senior-level keywords
+SENIOR_KEYWORDS = [
+    'senior', 'vecākais', 'expert', 'eksperts', 'experienced', 'pieredzējis',
+    '5+ years', '5+ gadi', '7+ years', '7+ gadi', '10+ years', '10+ gadi',
+    'extensive experience', 'plaša pieredze', 'significant experience', 'lead',
+    'vadošais', 'head', 'director', 'direktors'
+]
+
+_ENTRY_MATCHER = KeywordMatcher(ENTRY_KEYWORDS)
+_MID_MATCHER = KeywordMatcher(MID_KEYWORDS)
+_SENIOR_MATCHER = KeywordMatcher(SENIOR_KEYWORDS)
+
 def analyze_experience_required(title, description, requirements):
     """
     Analyze how much experience is required for the job.
@@ -399,60 +583,56 @@ def analyze_experience_required(title, description, requirements):
         requirements = ""
     
     text = f"{title} {description} {requirements}".lower()
-    
-    # Entry-level keywords
-    entry_keywords = [
-        'entry level', 'entry-level', 'junior', 'iesācēj', 'sākuma līmeņa', 
-        'no experience', 'bez pieredzes', 'graduate', 'absolvents', 'recent graduate',
-        'intern', 'internship', 'praktikants', 'prakse', 'trainee', 'māceklis',
-        'assistant', 'asistents'
-    ]
-    
-    # Mid-level keywords
-    mid_keywords = [
-        'mid level', 'mid-level', 'vidēja līmeņa', 'intermediate', 'experienced', 
-        'at least 2 years', 'vismaz 2 gadi', '2+ years', '3+ years', '2-4 years',
-        'ar pieredzi', 'with experience', 'pieredze līdzīgā amatā'
-    ]
-    
-    # Senior-level keywords
-    senior_keywords = [
-        'senior', 'vecākais', 'expert', 'eksperts', 'experienced', 'pieredzējis',
-        '5+ years', '5+ gadi', '7+ years', '7+ gadi', '10+ years', '10+ gadi',
-        'extensive experience', 'plaša pieredze', 'significant experience', 'lead',
-        'vadošais', 'head', 'director', 'direktors'
-    ]
+    return _score_experience(title.lower(), text)
 
+def _experience_adjustments(title, text):
+    """
+    Score implied by an explicit number of years (None if there is none), and
+    whether the title marks a junior or a senior role
+    """
     # Check for years of experience with regex
     years_pattern = r'(\d+)(?:\+)?.+?(year|gad|experience|pieredz)'
     years_match = re.search(years_pattern, text)
     
-    # Default to mid-level (0.5)
-    experience_score = 0.5
-    
-    # If specific years mentioned, adjust the score
+    years_score = None
     if years_match:
         try:
             years = int(years_match.group(1))
             if years == 0:
-                experience_score = 0.1
+                years_score = 0.1
             elif years <= 1:
-                experience_score = 0.2
+                years_score = 0.2
             elif years <= 3:
-                experience_score = 0.4
+                years_score = 0.4
             elif years <= 5:
-                experience_score = 0.6
+                years_score = 0.6
             elif years <= 8:
-                experience_score = 0.8
+                years_score = 0.8
             else:
-                experience_score = 0.9
+                years_score = 0.9
         except:
-            pass
+            years_score = 0.5
+    
+    junior_title = bool(re.search(r'(junior|iesācēj|asistent|praktikant)', title))
+    senior_title = bool(re.search(r'(senior|vecāk|lead|vadoš|direktors|head)', title))
+    
+    return years_score, junior_title, senior_title
+
+def _score_experience(title, text):
+    """Experience score from an already lowercased title and text"""
+    years_score, junior_title, senior_title = _experience_adjustments(title, text)
+    
+    # Default to mid-level (0.5)
+    experience_score = 0.5
+    
+    # If specific years mentioned, they decide the score
+    if years_score is not None:
+        experience_score = years_score
     else:
         # Count keyword occurrences
-        entry_count = sum(1 for kw in entry_keywords if kw in text)
-        mid_count = sum(1 for kw in mid_keywords if kw in text)
-        senior_count = sum(1 for kw in senior_keywords if kw in text)
+        entry_count = _ENTRY_MATCHER.present(text)
+        mid_count = _MID_MATCHER.present(text)
+        senior_count = _SENIOR_MATCHER.present(text)
         
         # Weight the counts
         weighted_score = (entry_count * 0.2 + mid_count * 0.5 + senior_count * 0.8)
@@ -464,14 +644,37 @@ def analyze_experience_required(title, description, requirements):
         # If no keywords found, leave as default mid-level
     
     # Additional adjustments based on job title
-    if re.search(r'(junior|iesācēj|asistent|praktikant)', title.lower()):
+    if junior_title:
         experience_score = max(experience_score - 0.2, 0.1)
         
-    if re.search(r'(senior|vecāk|lead|vadoš|direktors|head)', title.lower()):
+    if senior_title:
         experience_score = min(experience_score + 0.2, 0.9)
     
     return experience_score
 
+# High-stress keywords
+HIGH_STRESS_KEYWORDS = [
+    'deadline', 'deadlines', 'termiņi', 'termiņš', 'pressure', 'spiediens',
+    'fast-paced', 'ātrs temps', 'high volume', 'liels apjoms', 'stressful',
+    'stress', 'emergency', 'ārkārtas', 'urgent', 'steidzams', 'critical',
+    'kritiski', 'demanding', 'prasīgs', 'challenging', 'izaicinošs',
+    'intense', 'intensīvs', 'high pressure', 'augsts spiediens', 'difficult',
+    'overtime', 'virsstundas', 'weekend work', 'darbs brīvdienās', '24/7',
+    'on-call', 'dežūras', 'multiple projects', 'vairāki projekti'
+]
+
+# Low-stress keywords
+LOW_STRESS_KEYWORDS = [
+    'relaxed', 'relaksēts', 'friendly', 'draudzīgs', 'flexible', 'elastīgs',
+    'easy-going', 'balanced', 'līdzsvarots', 'work-life balance', 'darba un privātās dzīves līdzsvars',
+    'comfortable', 'ērts', 'supportive', 'atbalstošs', 'family-friendly', 'ģimenei draudzīgs',
+    'relaxed atmosphere', 'relaksēta atmosfēra', 'no pressure', 'bez spiediena',
+    'steady pace', 'mierīgs temps', 'regular hours', 'regulārs darba laiks'
+]
+
+_HIGH_STRESS_MATCHER = KeywordMatcher(HIGH_STRESS_KEYWORDS)
+_LOW_STRESS_MATCHER = KeywordMatcher(LOW_STRESS_KEYWORDS)
+
 def analyze_stress_level(description, responsibilities):
     """
     Analyze the likely stress level of the job.
@@ -485,43 +688,35 @@ def analyze_stress_level(description, responsibilities):
         responsibilities = ""
     
     text = f"{description} {responsibilities}".lower()
-    
-    # High-stress keywords
-    high_stress_keywords = [
-        'deadline', 'deadlines', 'termiņi', 'termiņš', 'pressure', 'spiediens',
-        'fast-paced', 'ātrs temps', 'high volume', 'liels apjoms', 'stressful',
-        'stress', 'emergency', 'ārkārtas', 'urgent', 'steidzams', 'critical',
-        'kritiski', 'demanding', 'prasīgs', 'challenging', 'izaicinošs',
-        'intense', 'intensīvs', 'high pressure', 'augsts spiediens', 'difficult',
-        'overtime', 'virsstundas', 'weekend work', 'darbs brīvdienās', '24/7',
-        'on-call', 'dežūras', 'multiple projects', 'vairāki projekti'
-    ]
-    
-    # Low-stress keywords
-    low_stress_keywords = [
-        'relaxed', 'relaksēts', 'friendly', 'draudzīgs', 'flexible', 'elastīgs',
-        'easy-going', 'balanced', 'līdzsvarots', 'work-life balance', 'darba un privātās dzīves līdzsvars',
-        'comfortable', 'ērts', 'supportive', 'atbalstošs', 'family-friendly', 'ģimenei draudzīgs',
-        'relaxed atmosphere', 'relaksēta atmosfēra', 'no pressure', 'bez spiediena',
-        'steady pace', 'mierīgs temps', 'regular hours', 'regulārs darba laiks'
-    ]
-    
-    # Count keyword occurrences
-    high_stress_count = sum(1 for kw in high_stress_keywords if kw in text)
-    low_stress_count = sum(1 for kw in low_stress_keywords if kw in text)
+    return _score_stress(text)
+
+def _stress_adjustments(text):
+    """Extra (high, low) stress points from deadlines, shift work and culture mentions"""
+    high_stress_bonus = 0
+    low_stress_bonus = 0
     
     # Check for multiple deadline mentions (indicates higher stress)
     deadline_matches = len(re.findall(r'deadline|termiņ', text))
     if deadline_matches > 1:
-        high_stress_count += deadline_matches
+        high_stress_bonus += deadline_matches
     
     # Check for phrases indicating night shifts or unpredictable hours
     if re.search(r'(night|nakts|shift work|maiņu darbs|unpredictable|neprognozējams|24/7)', text):
-        high_stress_count += 2
+        high_stress_bonus += 2
     
     # Check for mentions of relaxed culture
     if re.search(r'(work.?life.?balance|relax|friendly.?environment|support)', text):
-        low_stress_count += 1
+        low_stress_bonus += 1
+    
+    return high_stress_bonus, low_stress_bonus
+
+def _score_stress(text):
+    """Stress score from an already lowercased text"""
+    high_stress_bonus, low_stress_bonus = _stress_adjustments(text)
+    
+    # Count keyword occurrences
+    high_stress_count = _HIGH_STRESS_MATCHER.present(text) + high_stress_bonus
+    low_stress_count = _LOW_STRESS_MATCHER.present(text) + low_stress_bonus
     
     # Default to moderate stress level (0.5) if no indicators
     if high_stress_count + low_stress_count == 0:
@@ -530,6 +725,29 @@ def analyze_stress_level(description, responsibilities):
     # Calculate score (0 to 1)
     return high_stress_count / (high_stress_count + low_stress_count)
 
+# Creative role keywords
+CREATIVE_KEYWORDS = [
+    'creative', 'radošs', 'innovation', 'inovācija', 'design', 'dizains',
+    'create', 'radīt', 'develop', 'attīstīt', 'new ideas', 'jaunas idejas',
+    'brainstorm', 'prāta vētra', 'original', 'oriģināls', 'novel', 'jauns',
+    'think outside the box', 'domāt ārpus rāmjiem', 'imagination', 'iztēle',
+    'artisti', 'māksliniecisk', 'content creation', 'satura veidošana',
+    'solutions', 'risinājumi', 'problem solving', 'problēmu risināšana',
+    'initiative', 'iniciatīva', 'concept', 'koncepcija'
+]
+
+# Process-driven role keywords
+PROCESS_KEYWORDS = [
+    'follow', 'sekot', 'procedure', 'procedūra', 'protocol', 'protokols',
+    'standard', 'standarts', 'routine', 'rutīna', 'process', 'process',
+    'strict', 'stingrs', 'according to', 'saskaņā ar', 'guidelines', 'vadlīnijas',
+    'rules', 'noteikumi', 'regulations', 'regulējumi', 'methodology', 'metodoloģija',
+    'step-by-step', 'soli pa solim', 'structured', 'strukturēts'
+]
+
+_CREATIVE_MATCHER = KeywordMatcher(CREATIVE_KEYWORDS)
+_PROCESS_MATCHER = KeywordMatcher(PROCESS_KEYWORDS)
+
 def analyze_creativity_required(title, description, responsibilities):
     """
     Analyze how much creativity and innovation is required or valued in the job.
@@ -545,30 +763,12 @@ def analyze_creativity_required(title, description, responsibilities):
         responsibilities = ""
     
     text = f"{title} {description} {responsibilities}".lower()
-    
-    # Creative role keywords
-    creative_keywords = [
-        'creative', 'radošs', 'innovation', 'inovācija', 'design', 'dizains',
-        'create', 'radīt', 'develop', 'attīstīt', 'new ideas', 'jaunas idejas',
-        'brainstorm', 'prāta vētra', 'original', 'oriģināls', 'novel', 'jauns',
-        'think outside the box', 'domāt ārpus rāmjiem', 'imagination', 'iztēle',
-        'artisti', 'māksliniecisk', 'content creation', 'satura veidošana',
-        'solutions', 'risinājumi', 'problem solving', 'problēmu risināšana',
-        'initiative', 'iniciatīva', 'concept', 'koncepcija'
-    ]
-    
-    # Process-driven role keywords
-    process_keywords = [
-        'follow', 'sekot', 'procedure', 'procedūra', 'protocol', 'protokols',
-        'standard', 'standarts', 'routine', 'rutīna', 'process', 'process',
-        'strict', 'stingrs', 'according to', 'saskaņā ar', 'guidelines', 'vadlīnijas',
-        'rules', 'noteikumi', 'regulations', 'regulējumi', 'methodology', 'metodoloģija',
-        'step-by-step', 'soli pa solim', 'structured', 'strukturēts'
-    ]
-    
-    # Count keyword occurrences
-    creative_count = sum(1 for kw in creative_keywords if kw in text)
-    process_count = sum(1 for kw in process_keywords if kw in text)
+    return _score_creativity(title.lower(), text)
+
+def _creativity_adjustments(title, text):
+    """Extra (creative, process) points from the role in the title and key phrases"""
+    creative_bonus = 0
+    process_bonus = 0
     
     # Specific creative job roles get a bonus
     creative_roles = [
@@ -578,8 +778,8 @@ def analyze_creativity_required(title, description, responsibilities):
         'r&d', 'research and development', 'pētniec'
     ]
     
-    if any(role in title.lower() for role in creative_roles):
-        creative_count += 3
+    if any(role in title for role in creative_roles):
+        creative_bonus += 3
     
     # Process/standard roles
     standard_roles = [
@@ -588,15 +788,25 @@ def analyze_creativity_required(title, description, responsibilities):
         'security', 'apsardz', 'maintenance', 'apkop', 'teller', 'kasier'
     ]
     
-    if any(role in title.lower() for role in standard_roles):
-        process_count += 2
+    if any(role in title for role in standard_roles):
+        process_bonus += 2
     
     # Check for specific phrases
     if re.search(r'(creative|radoš|innovative|inovatīv).{1,20}(thinking|domāšan|mindset|approach)', text):
-        creative_count += 2
+        creative_bonus += 2
     
     if re.search(r'(follow|sekot|adhere to).{1,20}(procedure|procedūr|protocol|protokol)', text):
-        process_count += 2
+        process_bonus += 2
+    
+    return creative_bonus, process_bonus
+
+def _score_creativity(title, text):
+    """Creativity score from an already lowercased title and text"""
+    creative_bonus, process_bonus = _creativity_adjustments(title, text)
+    
+    # Count keyword occurrences
+    creative_count = _CREATIVE_MATCHER.present(text) + creative_bonus
+    process_count = _PROCESS_MATCHER.present(text) + process_bonus
     
     # Default to moderate creativity level (0.5) if no indicators
     if creative_count + process_count == 0:
@@ -625,3 +835,109 @@ def analyze_work_environment(teamwork_preference, stress_level, company_size):
     
     # Ensure score is between 0 and 1
     return max(0, min(environment_score, 1))
+
+class ListingScores(NamedTuple):
+    """All ten analyzer scores for one listing, named like the JobListing columns"""
+    teamwork_preference: float
+    work_environment: float
+    learning_opportunity: float
+    company_size: float
+    remote_preference: float
+    career_growth: float
+    project_type: float
+    experience_required: float
+    stress_level: float
+    creativity_required: float
+
+SCORE_FIELDS = ListingScores._fields
+
+def listing_texts(title, company, description, requirements, responsibilities, benefits):
+    """
+    Lowercase a listing's fields once and build the text each analyzer reads.
+
+    Returns a dict with the lowercased 'title' and 'company' plus one combined
+    text per analyzer.
+    """
+    title = (title or "").lower()
+    company = (company or "").lower()
+    description = (description or "").lower()
+    requirements = (requirements or "").lower()
+    responsibilities = (responsibilities or "").lower()
+    benefits = (benefits or "").lower()
+
+    title_description = f"{title} {description}"
+    return {
+        'title': title,
+        'company': company,
+        'full': f"{title_description} {requirements} {responsibilities}",
+        'company_size': f"{company} {description}",
+        'remote': f"{description} {requirements}",
+        'career_growth': f"{title_description} {benefits}",
+        'project_type': f"{title_description} {responsibilities}",
+        'experience': f"{title_description} {requirements}",
+        'stress': f"{description} {responsibilities}",
+        'creativity': f"{title_description} {responsibilities}"
+    }
+
+def analyze_listing(title, company, description, requirements, responsibilities, benefits):
+    """
+    Run every analyzer over one listing in a single pass.
+
+    Each field is lowercased once, the word-prefix keywords are counted in one
+    shared scan and the stress level is computed once for both its own score and
+    the work environment. The scores are the same as calling the individual
+    analyze_* functions.
+
+    Returns a ListingScores tuple.
+    """
+    texts = listing_texts(title, company, description, requirements, responsibilities, benefits)
+    title = texts['title']
+    word_counts = _WORD_PREFIX_MATCHER.counts(texts['full'])
+
+    teamwork_preference = _score_teamwork(title, texts['full'], word_counts)
+    company_size = _score_company_size(texts['company'], texts['company_size'])
+    stress_level = _score_stress(texts['stress'])
+
+    return ListingScores(
+        teamwork_preference=teamwork_preference,
+        work_environment=analyze_work_environment(teamwork_preference, stress_level, company_size),
+        learning_opportunity=_score_learning(title, texts['full'], word_counts),
+        company_size=company_size,
+        remote_preference=_score_remote(texts['remote']),
+        career_growth=_score_career_growth(title, texts['career_growth']),
+        project_type=_score_project_type(title, texts['project_type']),
+        experience_required=_score_experience(title, texts['experience']),
+        stress_level=stress_level,
+        creativity_required=_score_creativity(title, texts['creativity'])
+    )
+
+def analyze_batch(listings):
+    """
+    Score many listings, e.g. a chunk of the job_listings table.
+
+    Takes (title, company, description, requirements, responsibilities, benefits)
+    tuples and returns one ListingScores row per listing, in the same order.
+    Listings with the same text, such as reposted vacancies, are only scored once.
+    """
+    scored = {}
+    rows = []
+    for listing in listings:
+        listing = tuple(listing)
+        scores = scored.get(listing)
+        if scores is None:
+            scores = scored[listing] = analyze_listing(*listing)
+        rows.append(scores)
+    return rows
+
+def listing_hash(title, company, description, requirements, responsibilities, benefits):
+    """Hash of the text fields the analyzers read, to tell when a listing's inputs changed"""
+    fields = (title, company, description, requirements, responsibilities, benefits)
+    content = "\x1f".join(field or "" for field in fields)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+# Version of the scoring rules. Bump it whenever a keyword list, keyword weight or
+# scoring rule changes, so stored scores from older rules are recomputed
+RULES_VERSION = 1
+
+# Version stored next to a set of scores
+ANALYZER_VERSION = f"rules-{RULES_VERSION}"
@@ -0,0 +1,146 @@
+"""
+Seeded generator of synthetic cv.lv-like job listings for the benchmarks.
+
+The listings mix Latvian and English, use diacritics, bullet lists and the
+section headings the scraper looks for, and draw on the analyzer and category
+keywords so the benchmarks exercise the same code paths as real vacancies.
+Everything is generated offline from a fixed seed.
+"""
+import random
+
+TITLES = [
+    "Programmētājs", "Vecākais programmētājs", "Junior Python Developer", "Senior Software Engineer",
+    "Grāmatvedis", "Galvenā grāmatvede", "Klientu apkalpošanas speciālists", "Customer Service Agent",
+    "Pārdošanas vadītājs", "Sales Manager", "Noliktavas darbinieks", "Autovadītājs (C kategorija)",
+    "Projektu vadītājs", "Project Manager", "Mārketinga speciālists", "UX/UI Designer",
+    "Personāla vadītāja", "HR Business Partner", "Pavārs", "Medmāsa", "Jurists", "Apsardzes darbinieks",
+    "Elektriķis", "Būvinženieris", "Skolotājs", "Praktikants IT nodaļā", "Data Analyst", "DevOps Engineer"
+]
+
+COMPANIES = [
+    "SIA Baltic Solutions", "Swedbank", "SEB banka", "Maxima Latvija", "Rimi Latvia", "Tet",
+    "AS Latvenergo", "SIA Zaļā Dārzs", "Accenture", "Deloitte Latvia", "SIA Mazā Darbnīca",
+    "Citadele", "Circle K Latvia", "SIA Ģimenes Maiznīca", "Visma", "SIA Rīgas Ūdens", "Luminor"
+]
+
+INTRO = [
+    "Mēs esam strauji augošs uzņēmums ar {n} darbiniekiem visā Baltijā.",
+    "We are an international company with more than {n} employees worldwide.",
+    "Pievienojies mūsu komandai un strādā draudzīgā kolektīvā!",
+    "Join our team of {k} engineers working on innovative products.",
+    "Mūsu komanda ar {k} cilvēkiem meklē jaunu kolēģi.",
+    "Esam ģimenes uzņēmums ar ilggadēju pieredzi nozarē.",
+    "We are a startup building cutting-edge solutions for the retail market.",
+    "Uzņēmums ir tirgus līderis Latvijā un daļa no starptautiskas uzņēmumu grupas.",
+]
+
+DESCRIPTION = [
+    "Darbs ietver ikdienas sadarbību ar kolēģiem un klientiem.",
+    "You will collaborate with product managers, designers and other developers.",
+    "Strādāsi patstāvīgi, bet vajadzības gadījumā vienmēr varēsi saņemt atbalstu.",
+    "The role requires working independently and managing your own deadlines.",
+    "Darbs notiek birojā Rīgā, iespējams hibrīda darba režīms.",
+    "Fully remote position, you can work from anywhere in the EU.",
+    "Jābūt gatavam strādāt maiņu darbu, arī nakts maiņās un brīvdienās.",
+    "Fast-paced environment with multiple projects and tight deadlines.",
+    "Mierīgs temps, regulārs darba laiks un līdzsvarots darba un privātās dzīves līdzsvars.",
+    "You will design new ideas, run brainstorm sessions and create original concepts.",
+    "Darbs saskaņā ar noteiktām procedūrām, standartiem un vadlīnijām.",
+    "Projekts ir ilgtermiņa, ar stabilu finansējumu vairāku gadu garumā.",
+    "We work in agile scrum teams with two-week sprints and rapid prototyping.",
+    "Apmaksājam kursus, sertifikācijas un profesionālās izaugsmes iespējas.",
+    "Career path with clear promotion from within and mentorship programs.",
+    "Darbs saistīts ar dokumentu apstrādi, lietvedību un biroja administrēšanu.",
+    "Software development using Python, SQL, Docker and cloud services.",
+]
+
+REQUIREMENTS = [
+    "Augstākā izglītība ekonomikā, finansēs vai līdzīgā jomā",
+    "At least {y} years of experience in a similar role",
+    "Vismaz {y} gadu pieredze līdzīgā amatā",
+    "Latviešu valodas zināšanas C1 līmenī, angļu valoda B2",
+    "Strong knowledge of Python, JavaScript or Java",
+    "Spēja strādāt komandā un patstāvīgi",
+    "Self-motivated and detail oriented",
+    "B kategorijas autovadītāja apliecība",
+    "Pieredze klientu apkalpošanā tiks uzskatīta par priekšrocību",
+    "No experience required, we provide training",
+    "Precizitāte, atbildības sajūta un labas komunikācijas prasmes",
+]
+
+RESPONSIBILITIES = [
+    "Klientu konsultēšana klātienē un pa tālruni",
+    "Design, develop and maintain backend services",
+    "Sadarboties ar citām komandām un koordinēt projektu izpildi",
+    "Prepare presentations and take part in weekly meetings",
+    "Grāmatvedības uzskaites kārtošana un atskaišu sagatavošana",
+    "Kravas pārvadājumi un piegāde klientiem visā Latvijā",
+    "Support and maintenance of existing legacy systems",
+    "Jaunu produktu prototipu izstrāde un testēšana",
+    "Follow safety procedures and protocols at all times",
+    "Noliktavas uzturēšana un preču inventarizācija",
+]
+
+BENEFITS = [
+    "Konkurētspējīgs atalgojums un ikgadēji bonusi",
+    "Veselības apdrošināšana pēc pārbaudes laika",
+    "Flexible working hours and home office options",
+    "Apmācības un karjeras izaugsmes iespējas",
+    "Sporta kompensācija un korporatīvie pasākumi",
+    "Professional growth in an international environment",
+    "Draudzīgs un atbalstošs kolektīvs",
+]
+
+BULLETS = ["• ", "- ", "* ", "– ", ""]
+
+HEADINGS = {
+    'requirements': ["Prasības:", "Requirements:", "Mēs sagaidām:"],
+    'responsibilities': ["Pienākumi:", "Darba pienākumi:", "Responsibilities:"],
+    'benefits': ["Piedāvājam:", "Mēs piedāvājam:", "We offer:"],
+}
+
+def _fill(rng, template):
+    return template.format(n=rng.choice([8, 15, 45, 120, 300, 800, 2500]), k=rng.randint(3, 40), y=rng.randint(0, 10))
+
+def _bullet_list(rng, lines, count):
+    bullet = rng.choice(BULLETS)
+    return "\n".join(bullet + _fill(rng, line) for line in rng.sample(lines, min(count, len(lines))))
+
+def generate_listing(rng, length=1):
+    """
+    One synthetic listing as a dict with the analyzer input fields.
+
+    length scales the description; the scraper keeps the whole description
+    panel, which repeats the section lists, so long listings are common.
+    """
+    requirements = _bullet_list(rng, REQUIREMENTS, rng.randint(3, 7))
+    responsibilities = _bullet_list(rng, RESPONSIBILITIES, rng.randint(3, 7))
+    benefits = _bullet_list(rng, BENEFITS, rng.randint(2, 5))
+
+    paragraphs = [_fill(rng, rng.choice(INTRO))]
+    for _ in range(length):
+        paragraphs.append(" ".join(_fill(rng, rng.choice(DESCRIPTION)) for _ in range(rng.randint(2, 6))))
+    paragraphs += [
+        f"{rng.choice(HEADINGS['responsibilities'])}\n{responsibilities}",
+        f"{rng.choice(HEADINGS['requirements'])}\n{requirements}",
+        f"{rng.choice(HEADINGS['benefits'])}\n{benefits}",
+        f"Atalgojums: € {rng.randint(8, 30) * 100} - {rng.randint(31, 60) * 100} bruto mēnesī",
+    ]
+
+    return {
+        'title': rng.choice(TITLES),
+        'company': rng.choice(COMPANIES),
+        'description': "\n\n".join(paragraphs),
+        'requirements': requirements,
+        'responsibilities': responsibilities,
+        'benefits': benefits,
+    }
+
+def generate_corpus(size, seed=42):
+    """size synthetic listings; the same seed always gives the same corpus"""
+    rng = random.Random(seed)
+    return [generate_listing(rng, length=rng.choice([1, 2, 4, 8, 16])) for _ in range(size)]
+
+def corpus_bytes(listings, fields=('title', 'company', 'description', 'requirements', 'responsibilities', 'benefits')):
+    """UTF-8 size of the given fields over the whole corpus"""
+    return sum(len((listing[field] or "").encode('utf-8')) for listing in listings for field in fields)
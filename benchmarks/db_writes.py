@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Insert throughput of job listings into a fresh SQLite database.
+
+Run from the repository root:
+
+    python -m benchmarks.db_writes --rows 2000
+
+Compares committing every listing on its own with SQLite's default settings
+(how main.py used to save jobs) against database.JobWriter, which batches rows
+into one transaction with the WAL pragmas. Listings come from the synthetic
+corpus, so nothing touches the network or the real database.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from tabulate import tabulate
+
+from analyzer import SCORE_FIELDS
+from benchmarks.corpus import generate_corpus
+from database import Base, JobListing, JobWriter, set_sqlite_pragmas
+
+def _jobs(listings):
+    return [
+        JobListing(title=listing['title'], company=listing['company'], description=listing['description'],
+                   requirements=listing['requirements'], responsibilities=listing['responsibilities'],
+                   benefits=listing['benefits'], url=f"https://cv.lv/lv/vacancy/{i}",
+                   **{field: 0.5 for field in SCORE_FIELDS})
+        for i, listing in enumerate(listings)
+    ]
+
+def _engine(path, pragmas):
+    engine = create_engine(f'sqlite:///{path}')
+    if pragmas:
+        event.listen(engine, 'connect', set_sqlite_pragmas)
+    Base.metadata.create_all(engine)
+    return engine
+
+def commit_per_row(path, listings):
+    """session.add() and commit() for every job, default pragmas"""
+    engine = _engine(path, pragmas=False)
+    session = sessionmaker(bind=engine)()
+    for job in _jobs(listings):
+        session.add(job)
+        session.commit()
+    session.close()
+    engine.dispose()
+
+def batched_writer(path, listings, batch_size):
+    """JobWriter with one transaction per batch_size jobs"""
+    engine = _engine(path, pragmas=True)
+    with JobWriter(engine, batch_size=batch_size, flush_interval=None) as writer:
+        for job in _jobs(listings):
+            writer.add(job)
+    engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job listing inserts')
+    parser.add_argument('--rows', type=int, default=2000, help='Job listings to insert')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 50, 500], help='JobWriter batch sizes')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus generator seed')
+    args = parser.parse_args()
+
+    listings = generate_corpus(args.rows, args.seed)
+    runs = [('commit per row', lambda path: commit_per_row(path, listings))]
+    runs += [(f'JobWriter batch {size}', lambda path, size=size: batched_writer(path, listings, size))
+             for size in args.batch_sizes]
+
+    rows = []
+    baseline = None
+    for name, run in runs:
+        with tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            run(os.path.join(directory, 'bench.db'))
+            elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        rows.append([name, args.rows, f"{elapsed:.3f}", f"{args.rows / elapsed:.0f}", f"{baseline / elapsed:.1f}x"])
+    print(tabulate(rows, headers=['writer', 'rows', 'seconds', 'rows/s', 'speedup']))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmarks for the analyzers, the category classifier and the section splitter.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --sizes 100 1000 --output bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json
+
+Every benchmark runs on a seeded synthetic corpus (see corpus.py), so the
+numbers of two commits are comparable and nothing touches the network.
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import time
+
+from tabulate import tabulate
+
+import analyzer
+from scraper import SECTION_SPLITTER
+from update_categories import determine_category
+from benchmarks.corpus import corpus_bytes, generate_corpus
+
+# name -> (function, listing fields passed as its arguments)
+FUNCTIONS = {
+    'analyze_teamwork_preference': (analyzer.analyze_teamwork_preference,
+                                    ('title', 'description', 'requirements', 'responsibilities')),
+    'analyze_learning_opportunity': (analyzer.analyze_learning_opportunity,
+                                     ('title', 'description', 'requirements', 'responsibilities')),
+    'analyze_company_size': (analyzer.analyze_company_size, ('company', 'description')),
+    'analyze_remote_preference': (analyzer.analyze_remote_preference, ('description', 'requirements')),
+    'analyze_career_growth': (analyzer.analyze_career_growth, ('title', 'description', 'benefits')),
+    'analyze_project_type': (analyzer.analyze_project_type, ('title', 'description', 'responsibilities')),
+    'analyze_experience_required': (analyzer.analyze_experience_required,
+                                    ('title', 'description', 'requirements')),
+    'analyze_stress_level': (analyzer.analyze_stress_level, ('description', 'responsibilities')),
+    'analyze_creativity_required': (analyzer.analyze_creativity_required,
+                                    ('title', 'description', 'responsibilities')),
+    'determine_category': (determine_category, ('title', 'description')),
+    'split_sections': (SECTION_SPLITTER.split, ('description',)),
+}
+
+LISTING_FIELDS = ('title', 'company', 'description', 'requirements', 'responsibilities', 'benefits')
+
+def _time(run, repeat):
+    """Best wall-clock time of repeat runs"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def _result(name, listings, fields, seconds):
+    size = corpus_bytes(listings, fields)
+    return {
+        'benchmark': name,
+        'docs': len(listings),
+        'bytes': size,
+        'seconds': seconds,
+        'docs_per_sec': len(listings) / seconds if seconds else None,
+        'mb_per_sec': size / seconds / 1e6 if seconds else None,
+    }
+
+def run_benchmarks(sizes, repeat=3, seed=42, only=None):
+    """
+    Run every benchmark at every corpus size
+
+    Returns:
+        list: One result dict per (benchmark, size)
+    """
+    results = []
+    for size in sizes:
+        listings = generate_corpus(size, seed)
+        rows = [tuple(listing[field] for field in LISTING_FIELDS) for listing in listings]
+
+        benchmarks = {
+            name: (lambda func=func, args=args: [func(*(listing[a] for a in args)) for listing in listings], args)
+            for name, (func, args) in FUNCTIONS.items()
+        }
+        benchmarks['analyze_listing'] = (lambda: [analyzer.analyze_listing(*row) for row in rows], LISTING_FIELDS)
+        benchmarks['analyze_batch'] = (lambda: analyzer.analyze_batch(rows), LISTING_FIELDS)
+        benchmarks['pipeline'] = (
+            lambda: [(analyzer.analyze_listing(*row), determine_category(row[0], row[2])) for row in rows],
+            LISTING_FIELDS
+        )
+
+        for name, (run, fields) in benchmarks.items():
+            if only and name not in only:
+                continue
+            results.append(_result(name, listings, fields, _time(run, repeat)))
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _table(results, baseline=None):
+    """Results as a table, with the speedup over a previous run if given"""
+    previous = {}
+    if baseline:
+        previous = {(r['benchmark'], r['docs']): r for r in baseline['results']}
+    headers = ['benchmark', 'docs', 'seconds', 'docs/s', 'MB/s']
+    if baseline:
+        headers.append(f"vs {baseline.get('commit') or 'baseline'}")
+    rows = []
+    for r in results:
+        row = [r['benchmark'], r['docs'], f"{r['seconds']:.4f}", f"{r['docs_per_sec']:.1f}", f"{r['mb_per_sec']:.2f}"]
+        if baseline:
+            old = previous.get((r['benchmark'], r['docs']))
+            row.append(f"{old['seconds'] / r['seconds']:.2f}x" if old else "-")
+        rows.append(row)
+    return tabulate(rows, headers=headers)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the analyzers and category classifier')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000], help='Corpus sizes to run')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark, the best one counts')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus generator seed')
+    parser.add_argument('--only', nargs='+', help='Run only these benchmarks')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='JSON file of an earlier run to compare against')
+    args = parser.parse_args()
+
+    report = {
+        'commit': _git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': run_benchmarks(args.sizes, args.repeat, args.seed, args.only),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print(_table(report['results'], baseline))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.output}")
+
+if __name__ == "__main__":
+    main()
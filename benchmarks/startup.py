@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Cold-start import time report for the command line entry points.
+
+Run from the repository root:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --modules main --top 15
+
+Every module is imported in a fresh interpreter with `python -X importtime`,
+so nothing is shared with this process or between modules. The report shows
+each module's total import time and the slowest packages it pulled in.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from tabulate import tabulate
+
+ENTRY_POINTS = ['main', 'scraper', 'export_jobs', 'update_categories', 'reanalyze', 'database']
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_times(module):
+    """
+    Import module in a fresh interpreter
+
+    Returns:
+        list: (package, cumulative microseconds, nesting level) for every import, in import order
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    # Entry points log to scraper.log in the working directory
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True
+        )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        level = (len(name) - len(name.lstrip())) // 2
+        times.append((name.strip(), int(cumulative), level))
+    return times
+
+def report(modules, top=5, repeat=3):
+    """Rows of (module, best total ms, slowest direct imports) for the report table"""
+    rows = []
+    for module in modules:
+        best = None
+        for _ in range(repeat):
+            times = import_times(module)
+            total = next(cumulative for name, cumulative, level in reversed(times) if name == module and level == 0)
+            if best is None or total < best[0]:
+                best = (total, times)
+        total, times = best
+        # Children are listed before their parent, so the module's direct imports are
+        # the level 1 lines between the previous top-level import and the module itself
+        end = max(i for i, (name, _, level) in enumerate(times) if name == module and level == 0)
+        start = max((i for i, (_, _, level) in enumerate(times[:end]) if level == 0), default=-1) + 1
+        direct = sorted(
+            ((name, cumulative) for name, cumulative, level in times[start:end] if level == 1),
+            key=lambda item: item[1], reverse=True
+        )[:top]
+        slowest = ", ".join(f"{name} {cumulative / 1000:.0f}" for name, cumulative in direct)
+        rows.append([module, f"{total / 1000:.0f}", slowest])
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the import time of the entry points')
+    parser.add_argument('--modules', nargs='+', default=ENTRY_POINTS, help='Modules to import')
+    parser.add_argument('--top', type=int, default=5, help='Slowest direct imports to list per module')
+    parser.add_argument('--repeat', type=int, default=3, help='Imports per module, the fastest one counts')
+    args = parser.parse_args()
+
+    rows = report(args.modules, args.top, args.repeat)
+    print(tabulate(rows, headers=['module', 'import ms', 'slowest direct imports (ms)']))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import json
+import logging
+import os
+
+DEFAULT_DRIVER_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'chromedriver.json')
+
+def _chrome_major_version():
+    """Major version of the locally installed Chrome, or None if it cannot be determined"""
+    from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+    version = OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    return version.split('.')[0] if version else None
+
+def chromedriver_path(cache_path=DEFAULT_DRIVER_CACHE_PATH):
+    """
+    Path of a ChromeDriver binary for the installed Chrome
+
+    Resolving the driver with webdriver_manager asks the network for the
+    matching release on every call, so the resolved path is remembered in
+    cache_path together with the Chrome major version it was resolved for.
+    It is reused as long as the binary is still executable and Chrome has not
+    been upgraded to another major version, which is checked locally.
+    """
+    chrome_version = _chrome_major_version()
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        path = cached['path']
+        if os.access(path, os.X_OK) and cached.get('chrome_version') == chrome_version:
+            return path
+        logging.info("Cached ChromeDriver is missing or was resolved for another Chrome version")
+    except (OSError, ValueError, KeyError):
+        pass
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+    try:
+        with open(cache_path, 'w') as f:
+            json.dump({'path': path, 'chrome_version': chrome_version}, f)
+    except OSError as e:
+        logging.warning(f"Could not cache the ChromeDriver path: {e}")
+    return path
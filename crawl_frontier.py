@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_FRONTIER_PATH = os.path.join(os.path.dirname(__file__), 'crawl_frontier.db')
+
+# Kinds of frontier entries
+LIST_PAGE = 'list'
+DETAIL = 'detail'
+
+# States of frontier entries
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+class CrawlFrontier:
+    """
+    Persistent record of the list pages and job detail URLs of a crawl, kept in its own SQLite file
+
+    Every entry is pending, in flight, done or failed, with the number of
+    failed attempts and the last error. A crawl that was interrupted or died
+    leaves its unfinished entries behind, and resume() makes them pending
+    again so the next run continues where this one stopped.
+    """
+
+    def __init__(self, path=DEFAULT_FRONTIER_PATH):
+        self.path = path
+        # The crawl pipeline updates entries from several threads
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS frontier (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL UNIQUE,
+                    kind TEXT NOT NULL,
+                    page INTEGER,
+                    listing TEXT,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS ix_frontier_kind_state ON frontier (kind, state)")
+
+    def reset(self, pages):
+        """
+        Start a new crawl of the given list pages, forgetting the previous one
+
+        Args:
+            pages (list): (page number, list page URL) tuples
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM frontier")
+            self.conn.executemany(
+                "INSERT INTO frontier (url, kind, page, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(url, LIST_PAGE, page, PENDING, now) for page, url in pages]
+            )
+
+    def resume(self):
+        """
+        Make the in-flight and failed entries of an interrupted crawl pending again
+
+        Returns:
+            int: Number of entries left to crawl
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE frontier SET state = ?, updated_at = ? WHERE state IN (?, ?)",
+                (PENDING, time.time(), IN_FLIGHT, FAILED)
+            )
+            return self.conn.execute("SELECT COUNT(*) FROM frontier WHERE state = ?", (PENDING,)).fetchone()[0]
+
+    def pending_pages(self):
+        """(page number, URL) of the pending list pages, in page order"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT page, url FROM frontier WHERE kind = ? AND state = ? ORDER BY page", (LIST_PAGE, PENDING)
+            ).fetchall()
+
+    def pending_details(self):
+        """Listing dicts of the pending detail URLs, in the order they were found"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT listing FROM frontier WHERE kind = ? AND state = ? ORDER BY id", (DETAIL, PENDING)
+            ).fetchall()
+        return [json.loads(listing) for listing, in rows]
+
+    def finish_page(self, url, listings):
+        """Mark a list page done and add the detail URLs of its new listings, in one transaction"""
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO frontier (url, kind, listing, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(listing['url'], DETAIL, json.dumps(listing), PENDING, now) for listing in listings]
+            )
+            self.conn.execute("UPDATE frontier SET state = ?, updated_at = ? WHERE url = ?", (DONE, now, url))
+
+    def drop_pending_pages(self):
+        """Forget the list pages not crawled yet, when a crawl stops paging early"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM frontier WHERE kind = ? AND state = ?", (LIST_PAGE, PENDING))
+
+    def start(self, url):
+        """Mark an entry in flight"""
+        self._set_state(url, IN_FLIGHT)
+
+    def finish(self, url, state=DONE):
+        """Mark an entry done, or failed once it ran out of attempts"""
+        self._set_state(url, state)
+
+    def _set_state(self, url, state):
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE frontier SET state = ?, updated_at = ? WHERE url = ?", (state, time.time(), url))
+
+    def record_error(self, url, error):
+        """Count a failed attempt at an entry and keep its error"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE frontier SET attempts = attempts + 1, last_error = ?, updated_at = ? WHERE url = ?",
+                (f"{type(error).__name__}: {error}", time.time(), url)
+            )
+
+    def log_stats(self):
+        """Log the number of entries of each kind in each state"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT kind, state, COUNT(*) FROM frontier GROUP BY kind, state ORDER BY kind, state"
+            ).fetchall()
+        counts = ", ".join(f"{count} {kind} {state}" for kind, state, count in rows)
+        logging.info(f"Crawl frontier: {counts or 'empty'}")
+
+    def close(self):
+        """Close the frontier database"""
+        self.conn.close()
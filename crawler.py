@@ -0,0 +1,106 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+
+def with_retries(func, attempts=3, base_delay=1.0, on_error=None):
+    """
+    Call func until it succeeds, up to attempts times
+
+    After the nth failure (counting from 1) it sleeps base_delay * 2 ** (n - 1)
+    seconds with up to 50% random jitter, so retries of a struggling server
+    back off instead of hammering it.
+
+    Args:
+        func (callable): Function called without arguments
+        attempts (int): Maximum number of calls
+        base_delay (float): Seconds to wait after the first failure
+        on_error (callable, optional): Called as on_error(exception, attempt) after each failure
+
+    Returns:
+        The result of the first successful call; the last exception is raised if all of them fail
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except Exception as e:
+            if on_error:
+                on_error(e, attempt)
+            if attempt == attempts:
+                raise
+            delay = base_delay * 2 ** (attempt - 1) * (1 + random.random() / 2)
+            logging.warning(f"Attempt {attempt}/{attempts} failed: {e}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+class TokenBucket:
+    """
+    Rate limiter allowing rate requests per second on average, in bursts of up to capacity
+
+    Tokens are reserved rather than waited for, so concurrent threads queue up
+    in order.
+    """
+
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return the number of seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def wait(self):
+        """Wait for a token, blocking the calling thread"""
+        time.sleep(self.reserve())
+
+class DetailFetcher:
+    """
+    Fetches job detail pages for a CVLVScraper under a shared rate limit
+
+    The crawl pipeline calls fetch_details() from its fetch stage workers, so
+    up to that many pages are in flight at once, each started only when the
+    token bucket allows it. Pages that still need a browser are rendered with
+    Selenium in the same threads, as many at once as the scraper's WebDriver
+    pool allows.
+    """
+
+    def __init__(self, scraper, concurrency=4, rps=1.0):
+        self.scraper = scraper
+        self.limiter = TokenBucket(rps)
+        # Keep a pooled connection per concurrent request
+        scraper.configure_http(pool_size=concurrency)
+
+    def fetch_details(self, listing):
+        """
+        Fetch the details of one listing in the calling thread
+
+        Unlike get_job_details(), a failed request raises instead of giving empty
+        details. In 'auto' mode a failed HTTP request falls back to Selenium like
+        missing fields do, and only a failed Selenium load raises.
+        """
+        title, url = listing['title'], listing['url']
+        if self.scraper.fetch_mode != 'selenium':
+            self.limiter.wait()
+            try:
+                details = self.scraper.get_job_details_http(title, url, raise_errors=True)
+            except requests.RequestException as e:
+                if self.scraper.fetch_mode == 'http':
+                    raise
+                logging.info(f"HTTP fetch failed ({e}), loading with Selenium: {url}")
+            else:
+                if not self.scraper.needs_selenium(details, url):
+                    return details
+
+        self.limiter.wait()
+        return self.scraper.get_job_details_selenium(title, url, raise_errors=True)
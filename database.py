@@ -1,11 +1,26 @@
 import os
+import logging
 import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Float, Text, DateTime
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+from sqlalchemy import create_engine, event, inspect, text, Column, Index, Integer, String, Float, Text, DateTime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 Base = declarative_base()
 
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), 'job_listings.db')
+
+# Connection pool of each engine; the crawl pipeline's threads each check out a connection
+ENGINE_OPTIONS = {
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_timeout': 30,
+}
+
 class JobListing(Base):
     __tablename__ = 'job_listings'
     
@@ -31,18 +46,296 @@ class JobListing(Base):
     stress_level = Column(Float)
     creativity_required = Column(Float)
     job_category = Column(String(100))
+    content_hash = Column(String(40))
+    analyzer_version = Column(String(40))
+    category_version = Column(String(40))
     url = Column(String(500), unique=True)
     scraped_at = Column(DateTime, default=datetime.datetime.now)
+    
+    # Secondary indexes for job_queries: newest first, optionally within a category; without
+    # a category, a salary bound or a threshold on one of the score columns weighted highest
+    # by the frontend's matching is looked up in its own index (see job_queries.job_query)
+    __table_args__ = (
+        Index('ix_job_listings_scraped_at', 'scraped_at'),
+        Index('ix_job_listings_category_scraped_at', 'job_category', 'scraped_at'),
+        Index('ix_job_listings_salary_min', 'salary_min'),
+        Index('ix_job_listings_salary_max', 'salary_max'),
+        Index('ix_job_listings_learning_opportunity', 'learning_opportunity'),
+        Index('ix_job_listings_experience_required', 'experience_required'),
+        Index('ix_job_listings_work_environment', 'work_environment'),
+        Index('ix_job_listings_remote_preference', 'remote_preference'),
+    )
+
+# Applied to every new SQLite connection: WAL lets readers work while the crawl
+# writes, and with WAL synchronous=NORMAL only syncs at checkpoints
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64 * 1024,          # KiB, i.e. 64 MiB of page cache
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,              # ms to wait for other writers, e.g. update_categories.py
+}
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """SQLAlchemy connect event handler applying SQLITE_PRAGMAS"""
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+# Engines and session factories by absolute database path, created once per process
+_engines = {}
+_session_factories = {}
+_engines_lock = threading.Lock()
+
+def get_engine(db_path=None):
+    """
+    The engine of a database file, created and migrated on first use
+
+    The first call for a path creates the engine with ENGINE_OPTIONS and the
+    SQLITE_PRAGMAS connect event, creates missing tables and adds missing
+    columns, indexes and the full-text index; later calls return the same engine.
+
+    Args:
+        db_path (str, optional): Path to the SQLite database (default: DEFAULT_DB_PATH)
+
+    Returns:
+        Engine: SQLAlchemy engine shared by the whole process
+    """
+    db_path = os.path.abspath(db_path or DEFAULT_DB_PATH)
+    with _engines_lock:
+        engine = _engines.get(db_path)
+        if engine is None:
+            engine = create_engine(f'sqlite:///{db_path}', **ENGINE_OPTIONS)
+            event.listen(engine, 'connect', set_sqlite_pragmas)
+            Base.metadata.create_all(engine)
+            add_missing_columns(engine)
+            add_missing_indexes(engine)
+            add_search_index(engine)
+            _engines[db_path] = engine
+            # Objects stay readable after their session is closed
+            _session_factories[db_path] = sessionmaker(bind=engine, expire_on_commit=False)
+        return engine
+
+def get_readonly_engine(db_path=None):
+    """
+    Engine opening an existing database file read-only
+
+    Unlike get_engine() it creates and migrates nothing and leaves the journal
+    mode as it is, for scripts that only read, such as exports. Writes fail.
+
+    Args:
+        db_path (str, optional): Path to the SQLite database (default: DEFAULT_DB_PATH)
+
+    Returns:
+        Engine: A new SQLAlchemy engine; dispose() it when done
+    """
+    db_path = os.path.abspath(db_path or DEFAULT_DB_PATH)
+    # timeout is the busy timeout in seconds, to wait for a writer holding a lock
+    return create_engine(f"sqlite:///file:{quote(db_path)}?mode=ro&uri=true",
+                         connect_args={'timeout': 5})
 
 def init_db():
     """Initialize the database and create tables if they don't exist"""
-    db_path = os.path.join(os.path.dirname(__file__), 'job_listings.db')
-    engine = create_engine(f'sqlite:///{db_path}')
-    Base.metadata.create_all(engine)
-    return engine
-
-def get_session():
-    """Create a session for database operations"""
-    engine = init_db()
-    Session = sessionmaker(bind=engine)
-    return Session()
+    return get_engine()
+
+def add_missing_columns(engine):
+    """Add columns that were added to JobListing after the table was created"""
+    table = JobListing.__table__
+    existing = {column['name'] for column in inspect(engine).get_columns(table.name)}
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+def add_missing_indexes(engine):
+    """Create indexes that were added to JobListing after the table was created"""
+    with engine.begin() as conn:
+        for index in JobListing.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+# Listing text in the full-text index, and the table and columns of its triggers
+SEARCH_TABLE = 'job_listings_fts'
+SEARCH_VOCAB_TABLE = 'job_listings_fts_vocab'
+SEARCH_COLUMNS = ('title', 'company', 'description', 'requirements', 'responsibilities', 'benefits')
+
+def add_search_index(engine):
+    """
+    Create the FTS5 index over the listing text if the database does not have it yet
+
+    The index is an external-content table over job_listings, so the text is
+    not stored twice, kept in sync by triggers on insert, delete and updates
+    of the text columns; updating scores or categories does not touch it.
+    unicode61 with remove_diacritics 2 folds Latvian letters, so 'izglitiba'
+    finds 'izglītība'. An existing database is indexed once when the table is
+    created. SQLite builds without FTS5 only log a warning.
+    """
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+    delete_old = (f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, {columns}) "
+                  f"VALUES ('delete', old.id, {old_values});")
+    insert_new = f"INSERT INTO {SEARCH_TABLE} (rowid, {columns}) VALUES (new.id, {new_values});"
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': SEARCH_TABLE}
+        ).first()
+        if exists:
+            return
+        try:
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5({columns}, content='job_listings', "
+                f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+        except OperationalError as e:
+            logging.warning(f"Full-text search is not available: {e}")
+            return
+        conn.exec_driver_sql(f"CREATE VIRTUAL TABLE {SEARCH_VOCAB_TABLE} USING fts5vocab({SEARCH_TABLE}, 'row')")
+        conn.exec_driver_sql(f"CREATE TRIGGER job_listings_fts_insert AFTER INSERT ON job_listings BEGIN {insert_new} END")
+        conn.exec_driver_sql(f"CREATE TRIGGER job_listings_fts_delete AFTER DELETE ON job_listings BEGIN {delete_old} END")
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER job_listings_fts_update AFTER UPDATE OF {columns} ON job_listings "
+            f"BEGIN {delete_old} {insert_new} END"
+        )
+        conn.exec_driver_sql(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('rebuild')")
+
+def get_session(db_path=None):
+    """Create a session for database operations; the caller closes it"""
+    get_engine(db_path)
+    return _session_factories[os.path.abspath(db_path or DEFAULT_DB_PATH)]()
+
+@contextmanager
+def session_scope(db_path=None):
+    """
+    Session for one unit of work
+
+    The session is committed when the with block ends, rolled back if it
+    raises, and always closed. Every call gets its own session on the shared
+    engine, so worker threads can each hold one at the same time.
+    """
+    session = get_session(db_path)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+class JobWriter:
+    """
+    Buffers JobListing rows and inserts them in one transaction per batch
+
+    A batch is written once batch_size rows are waiting or flush_interval
+    seconds after the oldest of them was queued, whichever comes first, and
+    on flush() or close(). The interval is kept by a timer thread, so a row
+    is written in time even if no other row follows it; flush_interval=None
+    only writes full batches. Rows are inserted with a single executemany of
+    INSERT ... ON CONFLICT(url) DO NOTHING, so listings that are already in
+    the database are skipped instead of failing the batch.
+
+    After every committed batch, on_flush, if given, is called with the list
+    of JobListing objects that were inserted, e.g. to log them or mark them
+    done elsewhere, and on_skip with those that were already in the database.
+    If the write fails the batch stays queued and the error is raised, so the
+    next flush() tries it again. A failed timed write is logged and retried
+    after another flush_interval. on_flush and on_skip may be called from the
+    timer thread.
+    """
+
+    def __init__(self, engine, batch_size=50, flush_interval=5.0, on_flush=None, on_skip=None):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.on_skip = on_skip
+        self.inserted = 0
+        self.skipped = 0
+        self._buffer = []
+        # Pending threading.Timer for the oldest queued row, if any
+        self._timer = None
+        self._lock = threading.Lock()
+        table = JobListing.__table__
+        self._columns = [column.name for column in table.columns if not column.primary_key]
+        # RETURNING gives the URLs of the rows actually inserted, not those skipped as duplicates
+        self._statement = sqlite_insert(table).on_conflict_do_nothing(index_elements=['url']).returning(table.c.url)
+
+    def add(self, job):
+        """Queue a JobListing, writing the batch if it is full"""
+        if job.scraped_at is None:
+            job.scraped_at = datetime.datetime.now()
+        with self._lock:
+            self._buffer.append(job)
+            full = len(self._buffer) >= self.batch_size
+            if not full:
+                self._start_timer()
+        if full:
+            self.flush()
+
+    def _start_timer(self):
+        """Schedule a timed flush unless one is pending; called with the lock held"""
+        if self._timer is None and self.flush_interval is not None:
+            self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_timer(self):
+        """Drop the pending timed flush; called with the lock held"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _timed_flush(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            logging.error(f"Writing job listings failed, retrying in {self.flush_interval}s: {e}")
+            with self._lock:
+                if self._buffer:
+                    self._start_timer()
+
+    def flush(self):
+        """Write the queued rows in one transaction; returns the number of new rows"""
+        with self._lock:
+            jobs = self._buffer
+            if not jobs:
+                return 0
+            rows = [{name: getattr(job, name) for name in self._columns} for job in jobs]
+            with self.engine.begin() as conn:
+                inserted_urls = set(conn.execute(self._statement, rows).scalars())
+            # Only drop the batch once it is committed
+            self._buffer = []
+            self._cancel_timer()
+            inserted, skipped = [], []
+            for job in jobs:
+                if job.url in inserted_urls:
+                    inserted.append(job)
+                    # A URL queued twice in one batch is inserted once
+                    inserted_urls.discard(job.url)
+                else:
+                    skipped.append(job)
+            self.inserted += len(inserted)
+            self.skipped += len(skipped)
+        logging.info(f"Wrote {len(inserted)} job listings in one transaction"
+                     + (f", {len(skipped)} already in the database" if skipped else ""))
+        if self.on_flush and inserted:
+            self.on_flush(inserted)
+        if self.on_skip and skipped:
+            self.on_skip(skipped)
+        return len(inserted)
+
+    def close(self):
+        """Write the rows still queued and stop the timer"""
+        self.flush()
+        with self._lock:
+            self._cancel_timer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,109 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+class WebDriverPool:
+    """
+    Thread-safe pool of up to size WebDrivers created by factory
+
+    Threads check a driver out with `with pool.driver() as driver:` and block
+    while all of them are in use. Drivers are started on demand, health-checked
+    when checked out, and quit and replaced after max_pages pages or after the
+    browser fails with anything other than a page timeout.
+    """
+
+    def __init__(self, factory, size=1, max_pages=50):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._drivers = {}  # driver -> pages served
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+
+    @contextmanager
+    def driver(self):
+        """Check out a healthy driver for the duration of the with block"""
+        # Imported here, as only a crawl that renders pages needs Selenium
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        self._slots.acquire()
+        driver = None
+        try:
+            driver = self._checkout()
+            yield driver
+        except TimeoutException:
+            raise
+        except WebDriverException:
+            logging.warning("WebDriver failed, replacing it")
+            self._discard(driver)
+            driver = None
+            raise
+        finally:
+            if driver is not None:
+                self._checkin(driver)
+            self._slots.release()
+
+    def _checkout(self):
+        if self._closed:
+            raise RuntimeError("WebDriver pool is closed")
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._healthy(driver):
+                return driver
+            logging.warning("Discarding unresponsive WebDriver")
+            self._discard(driver)
+
+        driver = self.factory()
+        with self._lock:
+            self._drivers[driver] = 0
+            self.created += 1
+        return driver
+
+    def _checkin(self, driver):
+        with self._lock:
+            self._drivers[driver] += 1
+            worn_out = bool(self.max_pages) and self._drivers[driver] >= self.max_pages
+            if not worn_out and not self._closed:
+                self._idle.put(driver)
+                return
+            self.recycled += worn_out
+        self._discard(driver)
+
+    def _healthy(self, driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        if driver is None:
+            return
+        with self._lock:
+            self._drivers.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Error quitting WebDriver: {e}")
+
+    def close(self):
+        """Quit every idle driver; drivers still checked out are quit when returned"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        if self.created:
+            logging.info(f"WebDriver pool closed: started {self.created} drivers, "
+                         f"recycled {self.recycled} after {self.max_pages} pages")
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import json
 import argparse
-import sqlite3
 import os
 from datetime import datetime
 
@@ -17,22 +16,23 @@ def export_jobs_to_json(db_path, output_file):
         print(f"Database file '{db_path}' not found.")
         return False
     
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # This enables accessing columns by name
+    # SQLAlchemy is only loaded for an actual export
+    from sqlalchemy import text
+    from database import get_readonly_engine
     
+    engine = get_readonly_engine(db_path)
     try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, title, company, location, salary_min, salary_max, 
-                   description, requirements, responsibilities, benefits, 
-                   deadline, teamwork_preference, work_environment, learning_opportunity,
-                   company_size, remote_preference, career_growth, project_type,
-                   experience_required, stress_level, creativity_required,
-                   job_category, url, scraped_at
-            FROM job_listings
-        """)
-        
-        jobs = [dict(row) for row in cursor.fetchall()]
+        with engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT id, title, company, location, salary_min, salary_max, 
+                       description, requirements, responsibilities, benefits, 
+                       deadline, teamwork_preference, work_environment, learning_opportunity,
+                       company_size, remote_preference, career_growth, project_type,
+                       experience_required, stress_level, creativity_required,
+                       job_category, url, scraped_at
+                FROM job_listings
+            """)).mappings()
+            jobs = [dict(row) for row in rows]
         
         # Process jobs data for frontend use
         for job in jobs:
@@ -59,7 +59,7 @@ def export_jobs_to_json(db_path, output_file):
         return False
     
     finally:
-        conn.close()
+        engine.dispose()
 
 def main():
     parser = argparse.ArgumentParser(description='Export job listings to JSON')
@@ -0,0 +1,49 @@
+import logging
+import re
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+PARSERS = ('lxml', 'html.parser')
+
+def available_parser():
+    """The fastest installed parser backend: lxml if available, otherwise html.parser"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+def class_strainer(*classes):
+    """SoupStrainer keeping only the subtrees of elements that have any of the given classes"""
+    # While parsing, the class attribute is still one string, so match whole words in it
+    pattern = re.compile(r'(?:^|\s)(?:' + '|'.join(re.escape(c) for c in classes) + r')(?:\s|$)')
+    return SoupStrainer(attrs={'class': pattern})
+
+# Parts of cv.lv pages the scraper reads
+LISTING_ITEMS = class_strainer('vacancies-list__item')
+DETAIL_BLOCKS = class_strainer('react-tabs__tab-panel', 'vacancy-highlights__salary', 'vacancy-info__deadline')
+BASIC_INFO_BLOCKS = class_strainer('vacancy-highlights__salary', 'vacancy-info__deadline')
+SCRIPTS = SoupStrainer('script')
+
+def parse(markup, parse_only=None, parser=None, label='page', from_encoding=None):
+    """
+    Parse markup (str or bytes) with BeautifulSoup and log how long it took
+
+    Args:
+        markup (str | bytes): HTML document
+        parse_only (SoupStrainer, optional): Build only the matching subtrees
+        parser (str, optional): Backend from PARSERS (default: available_parser())
+        label (str): What was parsed, for the log line
+        from_encoding (str, optional): Encoding of bytes markup, detected if not given
+
+    Returns:
+        BeautifulSoup: The parsed (sub)document
+    """
+    parser = parser or available_parser()
+    started = time.perf_counter()
+    soup = BeautifulSoup(markup, parser, parse_only=parse_only,
+                         from_encoding=from_encoding if isinstance(markup, bytes) else None)
+    elapsed = time.perf_counter() - started
+    logging.info(f"Parsed {label} in {elapsed * 1000:.1f} ms with {parser}")
+    return soup
@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_HTTP_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'http_cache.db')
+
+# (URL regex, seconds a response is used without revalidation); the first match wins.
+# Search result pages change constantly, a published vacancy rarely does.
+DEFAULT_TTLS = [
+    (r'/search', 10 * 60),
+    (r'/vacancy/', 7 * 24 * 3600),
+    (r'', 3600),
+]
+
+class HTTPCache:
+    """
+    Disk-backed store of GET responses, kept in its own SQLite file
+
+    Bodies are stored zlib-compressed together with their ETag and
+    Last-Modified validators. Each URL gets the TTL of the first pattern in
+    ttls it matches; once that runs out the response is revalidated rather
+    than downloaded again. The store holds at most max_bytes of compressed
+    bodies and evicts the least recently used responses beyond that.
+    """
+
+    def __init__(self, path=DEFAULT_HTTP_CACHE_PATH, ttls=None, max_bytes=200 * 1024 * 1024):
+        self.path = path
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (ttls or DEFAULT_TTLS)]
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_downloaded = 0
+        # The crawler fetches from several threads
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    expires REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS ix_http_cache_last_used ON http_cache (last_used)")
+        self._size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+    def ttl(self, url):
+        """Seconds a response for url stays fresh"""
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return 0
+
+    def get(self, url):
+        """
+        Return the stored (status, headers, body, etag, last_modified, fresh) of url, or None
+
+        A fresh response counts as a hit, since it is served without a request.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT status, headers, body, etag, last_modified, expires FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            with self.conn:
+                self.conn.execute("UPDATE http_cache SET last_used = ? WHERE url = ?", (now, url))
+            status, headers, body, etag, last_modified, expires = row
+            fresh = expires > now
+            self.hits += fresh
+        return status, json.loads(headers), zlib.decompress(body), etag, last_modified, fresh
+
+    def put(self, url, status, headers, body):
+        """Store a response body and its headers, fresh for ttl(url) seconds"""
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                old = self.conn.execute("SELECT size FROM http_cache WHERE url = ?", (url,)).fetchone()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, status, json.dumps(dict(headers)), compressed, headers.get('ETag'),
+                     headers.get('Last-Modified'), now + self.ttl(url), len(compressed), now)
+                )
+            self._size += len(compressed) - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def refresh(self, url):
+        """Mark a stored response as fresh again after the server confirmed it is unchanged"""
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE http_cache SET expires = ?, last_used = ? WHERE url = ?",
+                    (now + self.ttl(url), now, url)
+                )
+            self.revalidated += 1
+
+    def record_download(self, size):
+        """Count a response that was downloaded in full, of size bytes"""
+        with self._lock:
+            self.misses += 1
+            self.bytes_downloaded += size
+
+    def _evict(self):
+        """Drop least recently used responses until the cache is below 90% of max_bytes"""
+        target = self.max_bytes * 0.9
+        evicted = 0
+        with self.conn:
+            for url, size in self.conn.execute(
+                "SELECT url, size FROM http_cache ORDER BY last_used"
+            ).fetchall():
+                if self._size <= target:
+                    break
+                self.conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+                self._size -= size
+                evicted += 1
+        logging.info(f"Evicted {evicted} least recently used responses from the HTTP cache")
+
+    def log_stats(self):
+        """Log hit, revalidation and miss counts and the bytes actually downloaded"""
+        with self._lock:
+            logging.info(f"HTTP cache: {self.hits} fresh hits, {self.revalidated} revalidated, "
+                         f"{self.misses} downloaded ({self.bytes_downloaded / 1024:.0f} KiB), "
+                         f"{self._size / 1024 / 1024:.1f} MiB stored")
+
+    def close(self):
+        """Close the cache database"""
+        self.conn.close()
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter that answers GET requests from an HTTPCache
+
+    Fresh responses are served without touching the network. Stale ones are
+    revalidated with If-None-Match/If-Modified-Since, so an unchanged page
+    costs a 304 with no body.
+    """
+
+    def __init__(self, cache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        cached = self.cache.get(request.url)
+        if cached:
+            status, headers, body, etag, last_modified, fresh = cached
+            if fresh:
+                return self._cached_response(request, status, headers, body)
+            if etag:
+                request.headers['If-None-Match'] = etag
+            if last_modified:
+                request.headers['If-Modified-Since'] = last_modified
+
+        response = super().send(request, **kwargs)
+        if cached and response.status_code == 304:
+            self.cache.refresh(request.url)
+            return self._cached_response(request, status, headers, body)
+
+        self.cache.record_download(len(response.content))
+        cache_control = response.headers.get('Cache-Control', '')
+        if response.status_code == 200 and 'no-store' not in cache_control:
+            self.cache.put(request.url, response.status_code, response.headers, response.content)
+        return response
+
+    def _cached_response(self, request, status, headers, body):
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK'
+        response.connection = self
+        return response
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import text, tuple_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.expression import UnaryExpression
+
+from analyzer import SCORE_FIELDS
+from database import SEARCH_TABLE, SEARCH_VOCAB_TABLE, JobListing, session_scope
+
+# Score columns with an index of their own in JobListing.__table_args__
+INDEXED_SCORE_FIELDS = ('learning_opportunity', 'experience_required', 'work_environment', 'remote_preference')
+
+# bm25() weights of the full-text columns, in database.SEARCH_COLUMNS order: matches in
+# the title count most, then the company, then the body text
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0, 1.0, 1.0, 1.0)
+
+class SearchResult(NamedTuple):
+    """One search_jobs() hit"""
+    job: JobListing
+    # bm25() rank, lower is more relevant
+    rank: float
+    # Matching text with the terms in [brackets]
+    snippet: str
+
+class JobPage(NamedTuple):
+    """One page of find_jobs() results"""
+    jobs: list
+    # (scraped_at, id) of the last job, to pass as after= for the next page; None on the last page
+    next_cursor: Optional[tuple]
+
+def _without_index(column):
+    """column behind SQLite's unary +, which keeps the query planner from using its index"""
+    return UnaryExpression(column, operator=operators.custom_op('+'), type_=column.type)
+
+def job_query(session, category=None, salary_from=None, salary_to=None, min_scores=None, after=None):
+    """
+    Job listings matching all given filters, newest first
+
+    Jobs without a salary are left out as soon as a salary bound is given, and
+    jobs without scraped_at are never returned.
+
+    Every query reads a bounded range of an index. A category is looked up in
+    (job_category, scraped_at), which also gives the order. Without one, a
+    salary bound or a threshold on one of INDEXED_SCORE_FIELDS selects the
+    matching range of its own index and only those jobs are sorted; SQLite
+    would otherwise walk the whole scraped_at index and test every row. With
+    no such filter, the query runs through the scraped_at index.
+
+    Args:
+        session: SQLAlchemy session
+        category (str): job_category to match exactly
+        salary_from (float): Only jobs whose salary_max reaches this
+        salary_to (float): Only jobs whose salary_min is at most this
+        min_scores (dict): Score field -> lowest accepted value
+        after (tuple): (scraped_at, id) of a job, to return only the jobs after it
+
+    Returns:
+        Query: Ordered by scraped_at and id, both descending
+    """
+    min_scores = min_scores or {}
+    query = session.query(JobListing).filter(JobListing.scraped_at.isnot(None))
+    if category is not None:
+        query = query.filter(JobListing.job_category == category)
+    if salary_from is not None:
+        query = query.filter(JobListing.salary_max >= salary_from)
+    if salary_to is not None:
+        query = query.filter(JobListing.salary_min <= salary_to)
+    for field, value in min_scores.items():
+        if field not in SCORE_FIELDS:
+            raise ValueError(f"Unknown score field: {field}")
+        query = query.filter(getattr(JobListing, field) >= value)
+    if after is not None:
+        query = query.filter(tuple_(JobListing.scraped_at, JobListing.id) < tuple_(*after))
+
+    range_filter = (salary_from is not None or salary_to is not None
+                    or any(field in INDEXED_SCORE_FIELDS for field in min_scores))
+    if category is None and range_filter:
+        return query.order_by(_without_index(JobListing.scraped_at).desc(), JobListing.id.desc())
+    return query.order_by(JobListing.scraped_at.desc(), JobListing.id.desc())
+
+def find_jobs(session, category=None, salary_from=None, salary_to=None, min_scores=None, limit=20, after=None):
+    """
+    One page of job listings matching the filters of job_query(), newest first
+
+    Pages are keyed on (scraped_at, id) instead of an OFFSET, so a page never
+    reads the rows of the pages before it.
+
+    Args:
+        limit (int): Jobs per page
+        after (tuple): next_cursor of the previous page, None for the first page
+
+    Returns:
+        JobPage: The jobs and the cursor of the next page
+    """
+    jobs = job_query(session, category, salary_from, salary_to, min_scores, after).limit(limit + 1).all()
+    if len(jobs) <= limit:
+        return JobPage(jobs, None)
+    jobs = jobs[:limit]
+    return JobPage(jobs, (jobs[-1].scraped_at, jobs[-1].id))
+
+def match_expression(query):
+    """
+    FTS5 MATCH expression of a free-text query: all of its words, in any column
+
+    Every word is quoted so punctuation such as 'C++' or 'full-time' is not
+    read as query syntax; a trailing * keeps its meaning of a prefix search,
+    which suits Latvian word endings ('programm*').
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    return " ".join(terms)
+
+def search_jobs(session, query, limit=20):
+    """
+    Full-text search over the title, company and text sections of the listings
+
+    Args:
+        session: SQLAlchemy session
+        query (str): Words that must all occur, see match_expression()
+        limit (int): Most relevant hits to return
+
+    Returns:
+        list: SearchResult of each hit, best match first
+    """
+    expression = match_expression(query)
+    if not expression:
+        return []
+    weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+    rows = session.execute(text(f"""
+        SELECT rowid, bm25({SEARCH_TABLE}, {weights}) AS rank,
+               snippet({SEARCH_TABLE}, -1, '[', ']', '...', 16) AS snippet
+        FROM {SEARCH_TABLE}
+        WHERE {SEARCH_TABLE} MATCH :expression
+        ORDER BY rank
+        LIMIT :limit
+    """), {'expression': expression, 'limit': limit}).all()
+    jobs = {job.id: job for job in session.query(JobListing).filter(JobListing.id.in_([row.rowid for row in rows]))}
+    return [SearchResult(jobs[row.rowid], row.rank, row.snippet) for row in rows if row.rowid in jobs]
+
+def keyword_counts(session, keywords):
+    """
+    Number of listings that contain each keyword or phrase, over the whole database
+
+    Keywords are tokenized like the listing text, so case and diacritics do
+    not matter and 'komandas darbs' counts the phrase.
+
+    Returns:
+        dict: keyword -> number of listings
+    """
+    counts = {}
+    for keyword in keywords:
+        phrase = keyword.replace('"', '""')
+        counts[keyword] = session.execute(
+            text(f"SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :phrase"), {'phrase': f'"{phrase}"'}
+        ).scalar()
+    return counts
+
+def top_terms(session, limit=50):
+    """
+    Most widespread terms of the full-text index
+
+    Returns:
+        list: (term, listings containing it, occurrences) tuples, most listings first
+    """
+    return session.execute(text(
+        f"SELECT term, doc, cnt FROM {SEARCH_VOCAB_TABLE} ORDER BY doc DESC, cnt DESC LIMIT :limit"
+    ), {'limit': limit}).all()
+
+def explain_query_plan(session, query):
+    """
+    SQLite's EXPLAIN QUERY PLAN of a query, with its parameters inlined
+
+    Returns:
+        list: Detail line of every step of the plan
+    """
+    compiled = query.statement.compile(dialect=session.get_bind().dialect, compile_kwargs={'literal_binds': True})
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return [detail for _, _, _, detail in rows]
+
+def plan_problems(plan):
+    """Steps of a query plan that read all of job_listings, through an index or not, instead of a range"""
+    return [detail for detail in plan if detail.startswith('SCAN job_listings')]
+
+def plan_checks():
+    """Filter combinations the frontend and the CLI query with, as find_jobs() keyword arguments"""
+    cursor = (datetime.datetime.now(), 0)
+    checks = [
+        {},
+        {'after': cursor},
+        {'category': 'IT'},
+        {'category': 'IT', 'after': cursor},
+        {'category': 'IT', 'salary_from': 1500, 'salary_to': 3000},
+        {'salary_from': 1500},
+        {'salary_to': 3000},
+    ]
+    checks += [{'min_scores': {field: 0.7}} for field in INDEXED_SCORE_FIELDS]
+    checks.append({'category': 'IT', 'min_scores': {field: 0.7 for field in INDEXED_SCORE_FIELDS}})
+    return checks
+
+def check_plans(session):
+    """
+    Assert that the plan_checks() queries only read a range of an index
+
+    Returns:
+        bool: True if none of them scans the whole table or one of its indexes
+    """
+    ok = True
+    for filters in plan_checks():
+        plan = explain_query_plan(session, job_query(session, **filters).limit(21))
+        problems = plan_problems(plan)
+        ok = ok and not problems
+        label = ", ".join(f"{key}={value}" for key, value in filters.items() if key != 'after')
+        label += " after cursor" if 'after' in filters else ""
+        print(f"{'FAIL' if problems else 'ok  '} {label or 'no filters'}: {'; '.join(plan)}")
+    return ok
+
+def parse_score(value):
+    """argparse type for --min-score field=value"""
+    field, _, threshold = value.partition('=')
+    if field not in SCORE_FIELDS:
+        raise argparse.ArgumentTypeError(f"Unknown score field '{field}', expected one of {', '.join(SCORE_FIELDS)}")
+    try:
+        return field, float(threshold)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Score threshold of '{field}' must be a number")
+
+def main():
+    parser = argparse.ArgumentParser(description='Query job listings by category, salary and scores')
+    parser.add_argument('--db', default=None, help='Path to SQLite database (default: job_listings.db next to this script)')
+    parser.add_argument('--category', help='Job category')
+    parser.add_argument('--salary-from', type=float, help='Lowest accepted maximum salary')
+    parser.add_argument('--salary-to', type=float, help='Highest accepted minimum salary')
+    parser.add_argument('--min-score', type=parse_score, action='append', default=[],
+                        help='Lowest accepted score as field=value, e.g. learning_opportunity=0.7 (repeatable)')
+    parser.add_argument('--search', help='Full-text search instead of filtering, e.g. "python attālināt*"')
+    parser.add_argument('--count', nargs='+', metavar='KEYWORD', help='Count the listings containing each keyword or phrase')
+    parser.add_argument('--top-terms', type=int, metavar='N', help='Print the N most widespread terms of the full-text index')
+    parser.add_argument('--limit', type=int, default=20, help='Jobs per page')
+    parser.add_argument('--pages', type=int, default=1, help='Pages to print')
+    parser.add_argument('--explain', action='store_true', help='Print the query plan of the query')
+    parser.add_argument('--check-plans', action='store_true',
+                        help='Check that the common queries use indexes, exit with status 1 if one does not')
+    args = parser.parse_args()
+
+    with session_scope(args.db) as session:
+        if args.check_plans:
+            sys.exit(0 if check_plans(session) else 1)
+        if args.search:
+            for result in search_jobs(session, args.search, args.limit):
+                print(f"{result.rank:8.3f}  {result.job.title} ({result.job.company})")
+                print(f"          {result.snippet}")
+            return
+        if args.count:
+            for keyword, count in keyword_counts(session, args.count).items():
+                print(f"{count:6d}  {keyword}")
+            return
+        if args.top_terms:
+            for term, listings, occurrences in top_terms(session, args.top_terms):
+                print(f"{listings:6d} {occurrences:7d}  {term}")
+            return
+
+        filters = dict(category=args.category, salary_from=args.salary_from, salary_to=args.salary_to,
+                       min_scores=dict(args.min_score))
+        if args.explain:
+            plan = explain_query_plan(session, job_query(session, **filters).limit(args.limit + 1))
+            print("\n".join(plan))
+            for problem in plan_problems(plan):
+                print(f"Not indexed: {problem}")
+
+        cursor = None
+        for number in range(1, args.pages + 1):
+            page = find_jobs(session, limit=args.limit, after=cursor, **filters)
+            print(f"Page {number}:")
+            for job in page.jobs:
+                salary = f"{job.salary_min or '?'}-{job.salary_max or '?'}" if job.salary_min or job.salary_max else "-"
+                scraped = f"{job.scraped_at:%Y-%m-%d %H:%M}" if job.scraped_at else "-"
+                print(f"  {scraped}  {job.title} ({job.company}), {job.job_category or '-'}, {salary}")
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+if __name__ == "__main__":
+    main()
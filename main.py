@@ -2,13 +2,16 @@
 import logging
 import time
 import argparse
-from scraper import CVLVScraper
-from database import get_session, JobListing
-from analyzer import (
-    analyze_teamwork_preference, analyze_learning_opportunity, analyze_company_size,
-    analyze_remote_preference, analyze_career_growth, analyze_project_type,
-    analyze_experience_required, analyze_stress_level, analyze_creativity_required, analyze_work_environment
-)
+from scraper import FETCH_MODES, CVLVScraper
+from html_parsing import PARSERS
+from crawler import DetailFetcher, with_retries
+from crawl_frontier import DEFAULT_FRONTIER_PATH, FAILED, CrawlFrontier
+from database import JobListing, JobWriter, get_engine, session_scope
+from analyzer import ANALYZER_VERSION, SCORE_FIELDS, analyze_listing, listing_hash
+from analysis_cache import DEFAULT_CACHE_PATH, AnalysisCache
+from http_cache import DEFAULT_HTTP_CACHE_PATH, HTTPCache
+from page_archive import DEFAULT_ARCHIVE_DIR, PageArchive
+from pipeline import Pipeline, Stage
 
 # Configure logging
 logging.basicConfig(
@@ -20,145 +23,297 @@ logging.basicConfig(
     ]
 )
 
+def is_known(session, listing):
+    """Check if the job is already in the database"""
+    existing_job = session.query(JobListing).filter_by(url=listing['url']).first()
+    if existing_job:
+        logging.info(f"Job already exists: {listing['title']}")
+    return existing_job is not None
+
+def analyze_details(cache, listing, details):
+    """
+    Analyze a scraped listing
+    
+    Returns:
+        JobListing: The analyzed job, or None for listings that are skipped
+    """
+    logging.info(f"Processing: {listing['title']}")
+    
+    # Skip image-only listings
+    if details.get('is_image_only'):
+        logging.info(f"Skipping image-only listing: {listing['title']}")
+        return None
+    
+    # Extract text fields for analysis
+    description = details.get('description', '')
+    requirements = details.get('requirements', '')
+    responsibilities = details.get('responsibilities', '')
+    benefits = details.get('benefits', '')
+    
+    # Analyze all job aspects in one pass
+    analyzer_inputs = (
+        listing['title'], listing['company'],
+        description, requirements, responsibilities, benefits
+    )
+    content_hash = listing_hash(*analyzer_inputs)
+    cached = cache.get(content_hash) if cache else None
+    if cached:
+        scores = cached.scores
+    else:
+        scores = analyze_listing(*analyzer_inputs)
+        if cache:
+            cache.put(content_hash, scores, details.get('job_category'))
+    
+    # Create job listing object
+    job = JobListing(
+        title=listing['title'],
+        company=listing['company'],
+        location=listing['location'],
+        salary_min=details.get('salary_min', listing['salary_min']),
+        salary_max=details.get('salary_max', listing['salary_max']),
+        description=description,
+        requirements=requirements,
+        responsibilities=responsibilities,
+        benefits=benefits,
+        deadline=details.get('deadline', ''),
+        **scores._asdict(),
+        content_hash=content_hash,
+        analyzer_version=ANALYZER_VERSION,
+        url=listing['url']
+    )
+    return job
+
+def log_saved(jobs):
+    """Log the scores of job listings written to the database"""
+    for job in jobs:
+        logging.info(f"Saved job: {job.title}")
+        for field in SCORE_FIELDS:
+            logging.info(f"  - {field.replace('_', ' ').capitalize()}: {getattr(job, field):.2f}")
+
+def known_urls(session, urls):
+    """The subset of urls already in the database, looked up in one query"""
+    if not urls:
+        return set()
+    rows = session.query(JobListing.url).filter(JobListing.url.in_(urls))
+    return {url for url, in rows}
+
+def discover_listings(scraper, limiter, frontier, session, stop_after_known=None, attempts=3):
+    """
+    Yield the listings of the frontier's pending list pages that are not in the database yet
+    
+    Detail URLs left pending by an interrupted crawl come first. With
+    stop_after_known, paging stops early after that many consecutive list
+    pages without a new listing (an incremental crawl).
+    """
+    # Listings still in the pipeline are not in the database yet
+    seen = set()
+    for listing in frontier.pending_details():
+        seen.add(listing['url'])
+        yield listing
+    
+    known_pages = 0
+    for page, url in frontier.pending_pages():
+        def load_page():
+            # List pages share the request rate limit with detail pages
+            limiter.wait()
+            logging.info(f"Scraping page {page}...")
+            return scraper.get_job_listings(page, raise_errors=True)
+        
+        frontier.start(url)
+        try:
+            listings = with_retries(load_page, attempts, on_error=lambda e, attempt: frontier.record_error(url, e))
+        except Exception as e:
+            logging.error(f"Giving up on page {page}: {e}")
+            frontier.finish(url, FAILED)
+            continue
+        
+        known = known_urls(session, [listing['url'] for listing in listings]) | seen
+        new_listings = [listing for listing in listings if listing['url'] not in known]
+        logging.info(f"Page {page}: {len(new_listings)} new, {len(listings) - len(new_listings)} already known")
+        frontier.finish_page(url, new_listings)
+        for listing in new_listings:
+            seen.add(listing['url'])
+            yield listing
+        
+        known_pages = 0 if new_listings else known_pages + 1
+        if stop_after_known and known_pages >= stop_after_known:
+            logging.info(f"No new listings on the last {known_pages} pages, stopping")
+            frontier.drop_pending_pages()
+            return
+
+def fetch_listing(fetcher, frontier, listing, attempts=3):
+    """Fetch the details of a listing, retrying failed requests with exponential backoff"""
+    url = listing['url']
+    frontier.start(url)
+    try:
+        details = with_retries(lambda: fetcher.fetch_details(listing), attempts,
+                               on_error=lambda e, attempt: frontier.record_error(url, e))
+    except Exception:
+        frontier.finish(url, FAILED)
+        raise
+    return listing, details
+
+def crawl(scraper, fetcher, frontier, writer, cache, args):
+    """
+    Scrape, analyze and save new job listings in a staged pipeline
+    
+    List pages are discovered, detail pages fetched (and parsed), listings
+    analyzed and jobs written to the database by separate worker threads
+    connected by bounded queues, so network waits and analysis overlap.
+    Every list page and detail URL is tracked in the frontier until its
+    job has been written; the writer marks written jobs done.
+    """
+    def analyze(item):
+        listing, details = item
+        job = analyze_details(cache, listing, details)
+        if job is None:
+            frontier.finish(listing['url'])
+        return job
+    
+    # The discovery thread checks for known URLs with its own session
+    with session_scope() as discovery_session:
+        pipeline = Pipeline(
+            discover_listings(scraper, fetcher.limiter, frontier, discovery_session,
+                              stop_after_known=args.known_pages if args.incremental else None,
+                              attempts=args.retries + 1),
+            [
+                Stage('fetch', lambda listing: fetch_listing(fetcher, frontier, listing, args.retries + 1),
+                      args.concurrency),
+                Stage('analyze', analyze, args.analyze_workers),
+                Stage('write', writer.add, 1),
+            ],
+            queue_size=args.queue_size
+        )
+        return pipeline.run()
+
+def replay_archive(scraper, session, writer, cache):
+    """Rebuild job listings from the archived pages, without network or browser"""
+    started = time.perf_counter()
+    replayed = 0
+    for listing in scraper.archived_job_listings():
+        if is_known(session, listing):
+            continue
+        details = scraper.get_archived_job_details(listing['title'], listing['url'])
+        if details is None:
+            logging.warning(f"No archived details for: {listing['url']}")
+            continue
+        job = analyze_details(cache, listing, details)
+        if job is not None:
+            writer.add(job)
+            replayed += 1
+    writer.flush()
+    logging.info(f"Replayed {replayed} job listings from the archive in {time.perf_counter() - started:.1f}s")
+
 def main():
     parser = argparse.ArgumentParser(description='Scrape job listings from cv.lv')
     parser.add_argument('--pages', type=int, default=1, help='Number of pages to scrape')
-    parser.add_argument('--delay', type=int, default=2, help='Delay between requests in seconds')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Stop paging once --known-pages consecutive pages have no new listings')
+    parser.add_argument('--known-pages', type=int, default=2,
+                        help='Consecutive pages without new listings that end an incremental crawl')
+    parser.add_argument('--delay', type=int, default=2, help='Delay between requests in seconds, unless --rps is given')
+    parser.add_argument('--rps', type=float, default=None, help='Maximum requests per second (default: 1 / --delay)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Number of job detail pages fetched at once')
+    parser.add_argument('--analyze-workers', type=int, default=1, help='Number of threads analyzing fetched listings')
+    parser.add_argument('--queue-size', type=int, default=20, help='Maximum items waiting between pipeline stages')
+    parser.add_argument('--batch-size', type=int, default=50, help='Job listings written to the database per transaction')
+    parser.add_argument('--flush-interval', type=float, default=5.0,
+                        help='Maximum seconds a job listing waits to be written to the database, if its batch is not full')
     parser.add_argument('--headless', action='store_true', default=True, help='Run browser in headless mode')
+    parser.add_argument('--browsers', type=int, default=1, help='Number of Chrome instances for pages that need a browser')
+    parser.add_argument('--page-timeout', type=float, default=10, help='Seconds to wait for a page\'s content to appear')
+    parser.add_argument('--request-timeout', type=float, default=None,
+                        help='Seconds an HTTP request may stall before it fails (default: --page-timeout)')
+    parser.add_argument('--settle-timeout', type=float, default=2, help='Maximum seconds to wait for a page to stop changing')
+    parser.add_argument('--parser', choices=PARSERS, default=None,
+                        help='HTML parser backend (default: lxml if installed, otherwise html.parser)')
+    parser.add_argument('--fetch-mode', choices=FETCH_MODES, default='auto',
+                        help='How to load job detail pages: over HTTP, with Selenium, or HTTP with Selenium fallback')
+    parser.add_argument('--http-cache', default=DEFAULT_HTTP_CACHE_PATH, help='Path to the HTTP response cache database')
+    parser.add_argument('--no-http-cache', action='store_true', help='Always download pages, without the HTTP cache')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='Path to the analysis cache database')
+    parser.add_argument('--no-cache', action='store_true', help='Always analyze, without the analysis cache')
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_DIR, help='Directory of the raw HTML page archive')
+    parser.add_argument('--no-archive', action='store_true', help='Do not archive fetched pages')
+    parser.add_argument('--replay', action='store_true',
+                        help='Rebuild the database from the page archive instead of scraping')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted crawl from the crawl frontier instead of starting at page 1')
+    parser.add_argument('--frontier', default=DEFAULT_FRONTIER_PATH, help='Path to the crawl frontier database')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='Times a failed page is retried, with exponential backoff, before it is marked failed')
     args = parser.parse_args()
+    if args.replay and args.no_archive:
+        parser.error("--replay needs the page archive")
     
     # Initialize scraper
+    archive = None if args.no_archive else PageArchive(args.archive)
+    http_cache = None if args.no_http_cache or args.replay else HTTPCache(args.http_cache)
     base_url = "https://cv.lv/lv/search?limit=20&offset=0&fuzzy=true"
-    scraper = CVLVScraper(base_url, delay_range=(args.delay, args.delay + 2), headless=args.headless)
+    scraper = CVLVScraper(base_url, headless=args.headless,
+                          fetch_mode=args.fetch_mode, browsers=args.browsers,
+                          page_timeout=args.page_timeout, settle_timeout=args.settle_timeout,
+                          request_timeout=args.request_timeout,
+                          parser=args.parser, http_cache=http_cache, archive=archive)
+    rps = args.rps or (1 / args.delay if args.delay > 0 else 1000.0)
+    fetcher = DetailFetcher(scraper, concurrency=args.concurrency, rps=rps)
+    
+    frontier = None if args.replay else CrawlFrontier(args.frontier)
+    
+    def finish(jobs):
+        if frontier:
+            for job in jobs:
+                frontier.finish(job.url)
     
-    # Initialize database session
-    session = get_session()
+    def on_flush(jobs):
+        log_saved(jobs)
+        finish(jobs)
+    
+    def on_skip(jobs):
+        for job in jobs:
+            logging.info(f"Already in the database: {job.url}")
+        finish(jobs)
+    
+    # Buffer new jobs and write them in batches, one transaction each
+    writer = JobWriter(get_engine(), batch_size=args.batch_size, flush_interval=args.flush_interval,
+                       on_flush=on_flush, on_skip=on_skip)
+    
+    # Reuse analysis results of listings seen before (e.g. reposted vacancies)
+    cache = None if args.no_cache else AnalysisCache(args.cache)
     
     try:
-        # Scrape specified number of pages
-        for page in range(1, args.pages + 1):
-            logging.info(f"Scraping page {page}...")
-            listings = scraper.get_job_listings(page)
-            
-            for listing in listings:
-                # Check if the job is already in the database
-                existing_job = session.query(JobListing).filter_by(url=listing['url']).first()
-                if existing_job:
-                    logging.info(f"Job already exists: {listing['title']}")
-                    continue
-                
-                logging.info(f"Processing: {listing['title']}")
-                
-                # Get detailed information
-                details = scraper.get_job_details(listing['title'], listing['url'])
-                
-                # Skip image-only listings
-                if details.get('is_image_only'):
-                    logging.info(f"Skipping image-only listing: {listing['title']}")
-                    continue
-                
-                # Extract text fields for analysis
-                description = details.get('description', '')
-                requirements = details.get('requirements', '')
-                responsibilities = details.get('responsibilities', '')
-                benefits = details.get('benefits', '')
-                
-                # Analyze various job aspects
-                teamwork_preference = analyze_teamwork_preference(
-                    listing['title'], description, requirements, responsibilities
-                )
-                    
-                company_size = analyze_company_size(
-                    listing['company'], description
-                )
-                
-                # Estimate work environment based on other factors
-                # This is separate from teamwork preference now
-                work_environment = analyze_work_environment(
-                    teamwork_preference, 
-                    analyze_stress_level(description, responsibilities),
-                    company_size
-                )
-                
-                learning_opportunity = analyze_learning_opportunity(
-                    listing['title'], description, requirements, responsibilities
-                )
-                
-                remote_preference = analyze_remote_preference(
-                    description, requirements
-                )
-                
-                career_growth = analyze_career_growth(
-                    listing['title'], description, benefits
-                )
-                
-                project_type = analyze_project_type(
-                    listing['title'], description, responsibilities
-                )
-                
-                # New analyzers
-                experience_required = analyze_experience_required(
-                    listing['title'], description, requirements
-                )
-                
-                stress_level = analyze_stress_level(
-                    description, responsibilities
-                )
-                
-                creativity_required = analyze_creativity_required(
-                    listing['title'], description, responsibilities
-                )
-                
-                # Create job listing object
-                job = JobListing(
-                    title=listing['title'],
-                    company=listing['company'],
-                    location=listing['location'],
-                    salary_min=details.get('salary_min', listing['salary_min']),
-                    salary_max=details.get('salary_max', listing['salary_max']),
-                    description=description,
-                    requirements=requirements,
-                    responsibilities=responsibilities,
-                    benefits=benefits,
-                    deadline=details.get('deadline', ''),
-                    teamwork_preference=teamwork_preference,
-                    work_environment=work_environment,
-                    learning_opportunity=learning_opportunity,
-                    company_size=company_size,
-                    remote_preference=remote_preference,
-                    career_growth=career_growth,
-                    project_type=project_type,
-                    experience_required=experience_required,
-                    stress_level=stress_level,
-                    creativity_required=creativity_required,
-                    url=listing['url']
-                )
-                
-                # Save to database
-                session.add(job)
-                session.commit()
-                
-                logging.info(f"Saved job: {job.title}")
-                logging.info(f"  - Teamwork preference: {teamwork_preference:.2f}")
-                logging.info(f"  - Work environment: {work_environment:.2f}")
-                logging.info(f"  - Learning opportunity: {learning_opportunity:.2f}")
-                logging.info(f"  - Company size: {company_size:.2f}")
-                logging.info(f"  - Remote preference: {remote_preference:.2f}")
-                logging.info(f"  - Career growth: {career_growth:.2f}")
-                logging.info(f"  - Project type: {project_type:.2f}")
-                logging.info(f"  - Experience required: {experience_required:.2f}")
-                logging.info(f"  - Stress level: {stress_level:.2f}")
-                logging.info(f"  - Creativity required: {creativity_required:.2f}")
-                
-            # Wait before fetching the next page
-            if page < args.pages:
-                time.sleep(args.delay)
+        if args.replay:
+            with session_scope() as session:
+                replay_archive(scraper, session, writer, cache)
+            return
+        
+        if args.resume and frontier.resume():
+            logging.info("Resuming the interrupted crawl")
+        else:
+            if args.resume:
+                logging.info("Nothing to resume, starting a new crawl")
+            frontier.reset([(page, scraper.list_page_url(page)) for page in range(1, args.pages + 1)])
+        
+        if not crawl(scraper, fetcher, frontier, writer, cache, args):
+            logging.info("Scraping interrupted by user")
                 
     except KeyboardInterrupt:
         logging.info("Scraping interrupted by user")
     finally:
         scraper.close()  # Ensure browser is closed
-        session.close()
+        writer.close()
+        if cache:
+            cache.log_stats()
+            cache.close()
+        if http_cache:
+            http_cache.log_stats()
+            http_cache.close()
+        if archive:
+            archive.log_stats()
+            archive.close()
+        if frontier:
+            frontier.log_stats()
+            frontier.close()
         logging.info("Job scraping completed")
 
 if __name__ == "__main__":
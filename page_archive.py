@@ -0,0 +1,159 @@
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), 'page_archive')
+
+# Kinds of archived pages
+LIST_PAGE = 'list'
+DETAIL_HTTP = 'detail_http'          # vacancy page as served to a plain GET
+DETAIL_RENDERED = 'detail'           # vacancy page rendered by Selenium
+DETAIL_SECOND_TAB = 'detail_tab'     # the rendered page after clicking its second tab
+
+class ArchivedPage(NamedTuple):
+    """One fetch of a page recorded in the archive"""
+    url: str
+    kind: str
+    content_type: Optional[str]
+    fetched_at: float
+    digest: str
+
+class PageArchive:
+    """
+    Append-only, content-addressed archive of fetched HTML
+
+    Page bodies are stored once per SHA-256 digest, each as its own gzip
+    member appended to numbered segment files of about segment_bytes. An
+    SQLite index maps digests to (segment, offset, length) and records every
+    fetch as (url, kind, content type, time, digest), so a page that did not
+    change between crawls costs one index row.
+    """
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR, segment_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        # The crawler archives pages from several threads
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    segment INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    content_type TEXT,
+                    fetched_at REAL NOT NULL,
+                    digest TEXT NOT NULL REFERENCES blobs (digest)
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS ix_pages_url_kind ON pages (url, kind, fetched_at)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS ix_pages_kind ON pages (kind, fetched_at)")
+        self.segment = self.conn.execute("SELECT COALESCE(MAX(segment), 1) FROM blobs").fetchone()[0]
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, f"segment-{segment:05d}.gz")
+
+    def store(self, url, kind, content, content_type=None):
+        """
+        Record a fetched page
+
+        Args:
+            url (str): Page URL
+            kind (str): One of LIST_PAGE, DETAIL_HTTP, DETAIL_RENDERED, DETAIL_SECOND_TAB
+            content (str | bytes): Page body; str is stored UTF-8 encoded
+            content_type (str, optional): Content-Type header of an HTTP response
+
+        Returns:
+            str: SHA-256 digest of the body
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            known = self.conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            with self.conn:
+                if not known:
+                    path = self._segment_path(self.segment)
+                    if os.path.exists(path) and os.path.getsize(path) >= self.segment_bytes:
+                        self.segment += 1
+                        path = self._segment_path(self.segment)
+                    compressed = gzip.compress(content)
+                    with open(path, 'ab') as f:
+                        offset = f.tell()
+                        f.write(compressed)
+                    self.conn.execute(
+                        "INSERT INTO blobs VALUES (?, ?, ?, ?, ?)",
+                        (digest, self.segment, offset, len(compressed), len(content))
+                    )
+                self.conn.execute(
+                    "INSERT INTO pages (url, kind, content_type, fetched_at, digest) VALUES (?, ?, ?, ?, ?)",
+                    (url, kind, content_type, time.time(), digest)
+                )
+        return digest
+
+    def read(self, digest):
+        """Body stored under digest, as bytes"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT segment, offset, length FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        segment, offset, length = row
+        with open(self._segment_path(segment), 'rb') as f:
+            f.seek(offset)
+            return gzip.decompress(f.read(length))
+
+    def latest(self, url, kinds, since=None):
+        """Most recent ArchivedPage of url with one of kinds, fetched at or after since; None if there is none"""
+        placeholders = ", ".join("?" * len(kinds))
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT url, kind, content_type, fetched_at, digest FROM pages "
+                f"WHERE url = ? AND kind IN ({placeholders}) AND fetched_at >= ? "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (url, *kinds, since or 0)
+            ).fetchone()
+        return ArchivedPage(*row) if row else None
+
+    def pages(self, kind):
+        """The latest ArchivedPage of every URL of the given kind, in the order URLs were first fetched"""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT url, kind, content_type, fetched_at, digest FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY url ORDER BY id DESC) AS newest,
+                           MIN(id) OVER (PARTITION BY url) AS first_id
+                    FROM pages WHERE kind = ?
+                ) WHERE newest = 1 ORDER BY first_id
+            """, (kind,)).fetchall()
+        return [ArchivedPage(*row) for row in rows]
+
+    def log_stats(self):
+        """Log the number of recorded fetches and the stored sizes"""
+        with self._lock:
+            fetches = self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            blobs, size, compressed = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(length), 0) FROM blobs"
+            ).fetchone()
+        logging.info(f"Page archive: {fetches} fetches, {blobs} distinct pages, "
+                     f"{size / 1024 / 1024:.1f} MiB stored in {compressed / 1024 / 1024:.1f} MiB")
+
+    def close(self):
+        """Close the archive index"""
+        self.conn.close()
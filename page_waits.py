@@ -0,0 +1,102 @@
+import logging
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Installs a MutationObserver on first call and returns the milliseconds since the last DOM change
+_MUTATION_AGE_JS = """
+if (!window.__cvlvObserver) {
+    window.__cvlvLastMutation = performance.now();
+    window.__cvlvObserver = new MutationObserver(function () {
+        window.__cvlvLastMutation = performance.now();
+    });
+    window.__cvlvObserver.observe(document.documentElement,
+        {childList: true, subtree: true, characterData: true, attributes: true});
+}
+return performance.now() - window.__cvlvLastMutation;
+"""
+
+_SELECTED_TEXT_JS = """
+var element = document.querySelector(arguments[0]);
+return element ? element.innerText : null;
+"""
+
+class PageWaits:
+    """
+    Explicit readiness waits for one loaded page, timing each of them
+
+    Instead of sleeping for a fixed time, each wait polls a condition: a
+    selector being present, the DOM having been quiet for quiet_period
+    seconds, or an element's text changing after a click. timings maps each
+    wait's name to the seconds it actually took; used as a context manager,
+    the timings are logged and appended to history as (url, timings) on exit.
+    """
+
+    def __init__(self, driver, url, timeout=10, settle_timeout=2, quiet_period=0.25, poll_frequency=0.05,
+                 history=None):
+        self.driver = driver
+        self.url = url
+        self.timeout = timeout
+        self.settle_timeout = settle_timeout
+        self.quiet_period = quiet_period
+        self.poll_frequency = poll_frequency
+        self.history = history
+        self.timings = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.timings:
+            self.log()
+            if self.history is not None:
+                self.history.append((self.url, dict(self.timings)))
+        return False
+
+    def _until(self, name, condition, timeout):
+        started = time.perf_counter()
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    def selector(self, css_selector, name=None):
+        """Wait until an element matching css_selector is present; raises TimeoutException"""
+        return self._until(
+            name or css_selector, EC.presence_of_element_located((By.CSS_SELECTOR, css_selector)), self.timeout
+        )
+
+    def quiet(self, name='quiet'):
+        """
+        Wait until the DOM has not changed for quiet_period seconds
+
+        Pages that keep animating never settle; after settle_timeout the wait
+        gives up and the page is used as it is.
+        """
+        quiet_ms = self.quiet_period * 1000
+        try:
+            self._until(name, lambda driver: driver.execute_script(_MUTATION_AGE_JS) >= quiet_ms,
+                        self.settle_timeout)
+            return True
+        except TimeoutException:
+            logging.debug(f"DOM of {self.url} did not settle within {self.settle_timeout}s")
+            return False
+
+    def text(self, css_selector):
+        """innerText of the first element matching css_selector, or None"""
+        return self.driver.execute_script(_SELECTED_TEXT_JS, css_selector)
+
+    def text_changed(self, css_selector, old_text, name=None):
+        """Wait until the element matching css_selector has non-empty text other than old_text"""
+        def changed(driver):
+            text = driver.execute_script(_SELECTED_TEXT_JS, css_selector)
+            return bool(text) and text != old_text
+        return self._until(name or css_selector, changed, self.timeout)
+
+    def log(self):
+        """Log how long each wait on this page took"""
+        waits = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items())
+        logging.info(f"Waits for {self.url}: {waits} (total {sum(self.timings.values()):.2f}s)")
@@ -0,0 +1,135 @@
+import logging
+import queue
+import threading
+import time
+
+_DONE = object()
+
+class Stage:
+    """
+    One pipeline stage: workers threads applying func to the items of its input queue
+
+    func returns the item for the next stage, or None to drop it.
+    """
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.lock = threading.Lock()
+
+class Pipeline:
+    """
+    Runs the items of a source iterator through stages connected by bounded queues
+
+    Each stage has its own worker threads and a queue of at most queue_size
+    items in front of it, so a slow stage makes the stages before it wait
+    instead of piling up work in memory. On Ctrl-C the source stops and the
+    items already in the pipeline are finished; a second Ctrl-C drops them.
+    """
+
+    def __init__(self, source, stages, queue_size=20):
+        self.source = source
+        self.stages = stages
+        self.queue_size = queue_size
+        self.stopping = threading.Event()
+        self.aborting = threading.Event()
+        self.sourced = 0
+
+    def _put(self, q, item):
+        # Time out regularly so an abort never leaves a producer blocked on a full queue
+        while not self.aborting.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _feed(self, out_queue, workers):
+        try:
+            for item in self.source:
+                if self.stopping.is_set():
+                    break
+                self.sourced += 1
+                self._put(out_queue, item)
+        except Exception as e:
+            logging.error(f"Pipeline source failed: {e}")
+        finally:
+            for _ in range(workers):
+                out_queue.put(_DONE)
+
+    def _work(self, stage, in_queue, out_queue, next_workers, finished):
+        while True:
+            item = in_queue.get()
+            if item is _DONE:
+                break
+            if self.aborting.is_set():
+                continue
+            started = time.perf_counter()
+            failed = False
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                logging.error(f"Pipeline stage {stage.name} failed: {e}")
+                failed = True
+                result = None
+            with stage.lock:
+                stage.busy += time.perf_counter() - started
+                stage.processed += 1
+                stage.failed += failed
+            if result is not None and out_queue is not None:
+                self._put(out_queue, result)
+
+        # The last worker of a stage to finish tells the next stage's workers to stop
+        with stage.lock:
+            finished[0] += 1
+            last = finished[0] == stage.workers
+        if last and out_queue is not None:
+            for _ in range(next_workers):
+                out_queue.put(_DONE)
+
+    def run(self):
+        """Run until the source is exhausted and every item went through all stages"""
+        started = time.perf_counter()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = [threading.Thread(
+            target=self._feed, args=(queues[0], self.stages[0].workers), name='pipeline-source', daemon=True
+        )]
+        for i, stage in enumerate(self.stages):
+            last = i == len(self.stages) - 1
+            out_queue = None if last else queues[i + 1]
+            next_workers = 0 if last else self.stages[i + 1].workers
+            finished = [0]
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work, args=(stage, queues[i], out_queue, next_workers, finished),
+                    name=f"pipeline-{stage.name}-{n}", daemon=True
+                ))
+        for thread in threads:
+            thread.start()
+
+        while any(thread.is_alive() for thread in threads):
+            try:
+                for thread in threads:
+                    thread.join(timeout=0.2)
+            except KeyboardInterrupt:
+                if self.stopping.is_set():
+                    logging.info("Interrupted again, dropping the items still in the pipeline")
+                    self.aborting.set()
+                else:
+                    logging.info("Interrupted, finishing the items already in the pipeline (Ctrl-C again to drop them)")
+                    self.stopping.set()
+
+        self.log_stats(time.perf_counter() - started)
+        return not self.stopping.is_set()
+
+    def log_stats(self, elapsed):
+        """Log how many items each stage handled and how busy its workers were"""
+        logging.info(f"Pipeline finished in {elapsed:.1f}s, {self.sourced} items from the source")
+        for stage in self.stages:
+            utilization = stage.busy / (elapsed * stage.workers) if elapsed else 0.0
+            logging.info(f"  - {stage.name}: {stage.processed} items, {stage.failed} failed, "
+                         f"{stage.workers} workers {utilization:.0%} busy")
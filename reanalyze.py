@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+import os
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from analysis_cache import DEFAULT_CACHE_PATH, AnalysisCache
+from analyzer import ANALYZER_VERSION, SCORE_FIELDS, analyze_batch, listing_hash
+from update_categories import add_column_if_not_exists, determine_category
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+ANALYZER_COLUMNS = "title, company, description, requirements, responsibilities, benefits"
+
+def analyze_chunk(rows):
+    """
+    Score one chunk of job_listings rows in a worker process
+
+    Args:
+        rows (list): (id, content_hash, title, company, description, requirements,
+            responsibilities, benefits) tuples
+
+    Returns:
+        list: (id, content_hash, scores, category) tuples; the category is only
+            computed for the analysis cache
+    """
+    all_scores = analyze_batch([row[2:] for row in rows])
+    return [
+        (job_id, content_hash, scores, determine_category(title, description))
+        for (job_id, content_hash, title, company, description, *_), scores in zip(rows, all_scores)
+    ]
+
+def iter_chunks(conn, chunk_size):
+    """
+    Read job_listings in id order, chunk_size rows at a time
+
+    Uses keyset pagination so no read cursor stays open while results are written.
+    """
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            f"SELECT id, content_hash, analyzer_version, {ANALYZER_COLUMNS} "
+            "FROM job_listings WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, chunk_size)
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+def stale_rows(rows, force=False):
+    """
+    Keep the rows whose analyzer inputs or analyzer version changed since they were scored
+
+    Returns (id, content_hash, title, company, ...) tuples for analyze_chunk().
+    """
+    stale = []
+    for job_id, stored_hash, stored_version, *inputs in rows:
+        content_hash = listing_hash(*inputs)
+        if force or content_hash != stored_hash or stored_version != ANALYZER_VERSION:
+            stale.append((job_id, content_hash, *inputs))
+    return stale
+
+def write_scores(conn, results):
+    """
+    Apply one chunk of (id, content_hash, scores, ...) results in a single transaction
+
+    A row whose text changed since its last hash also loses its
+    category_version, so the next category update recomputes its category.
+    """
+    assignments = ", ".join(f"{field} = ?" for field in SCORE_FIELDS)
+    with conn:
+        conn.executemany(
+            f"UPDATE job_listings SET {assignments}, content_hash = ?, analyzer_version = ?, "
+            "category_version = CASE WHEN content_hash IS NULL OR content_hash = ? "
+            "THEN category_version END "
+            "WHERE id = ?",
+            [
+                (*scores, content_hash, ANALYZER_VERSION, content_hash, job_id)
+                for job_id, content_hash, scores, *_ in results
+            ]
+        )
+
+def reanalyze_jobs(db_path, workers=None, chunk_size=200, force=False, cache_path=DEFAULT_CACHE_PATH):
+    """
+    Recompute the analyzer scores of stored job listings
+
+    Chunks are read by the main process, which skips rows whose content hash
+    and analyzer version are unchanged and takes what it can from the analysis
+    cache. The rest is scored by a pool of worker processes and written back
+    by the main process, one transaction per chunk.
+    At most two chunks per worker are in flight, so memory stays flat on large
+    tables.
+
+    Args:
+        db_path (str): Path to SQLite database
+        workers (int, optional): Number of worker processes (default: CPU count)
+        chunk_size (int): Rows per chunk and per write transaction
+        force (bool): Re-score every row, changed or not
+        cache_path (str, optional): Analysis cache database, None to always compute
+
+    Returns:
+        int: Number of rows updated
+    """
+    workers = workers or os.cpu_count() or 1
+    conn = sqlite3.connect(db_path)
+    cache = AnalysisCache(cache_path) if cache_path else None
+    try:
+        cursor = conn.cursor()
+        for column in ("content_hash", "analyzer_version", "category_version"):
+            add_column_if_not_exists(cursor, "job_listings", column, "VARCHAR(40)")
+        conn.commit()
+
+        total = conn.execute("SELECT COUNT(*) FROM job_listings").fetchone()[0]
+        logging.info(f"Checking {total} jobs for analyzer version {ANALYZER_VERSION} "
+                     f"with {workers} workers in chunks of {chunk_size}")
+
+        scanned = 0
+        done = 0
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+
+            def write(results):
+                nonlocal done
+                write_scores(conn, results)
+                done += len(results)
+                elapsed = time.perf_counter() - started
+                logging.info(f"Re-analyzed {done} jobs, checked {scanned}/{total} "
+                             f"({done / elapsed:.1f} jobs/s)")
+
+            def write_oldest():
+                results = pending.popleft().result()
+                if cache:
+                    cache.put_many([(content_hash, scores, category) for _, content_hash, scores, category in results])
+                write(results)
+
+            for rows in iter_chunks(conn, chunk_size):
+                scanned += len(rows)
+                rows = stale_rows(rows, force)
+                if cache and rows:
+                    cached = cache.get_many([row[1] for row in rows])
+                    if cached:
+                        write([(row[0], row[1], cached[row[1]].scores) for row in rows if row[1] in cached])
+                        rows = [row for row in rows if row[1] not in cached]
+                if not rows:
+                    continue
+                pending.append(pool.submit(analyze_chunk, rows))
+                if len(pending) >= workers * 2:
+                    write_oldest()
+            while pending:
+                write_oldest()
+
+        elapsed = time.perf_counter() - started
+        logging.info(f"Updated scores of {done} jobs in {elapsed:.1f}s, {total - done} were up to date")
+        return done
+
+    except sqlite3.Error as e:
+        logging.error(f"Database error: {e}")
+        return 0
+    finally:
+        if cache:
+            cache.log_stats()
+            cache.close()
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute analyzer scores for stored job listings')
+    parser.add_argument('--db', default='job_listings.db', help='Path to SQLite database')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=200, help='Rows per chunk and per write transaction')
+    parser.add_argument('--force', action='store_true', help='Re-score all jobs, even unchanged ones')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='Path to the analysis cache database')
+    parser.add_argument('--no-cache', action='store_true', help='Always analyze, without the analysis cache')
+    args = parser.parse_args()
+
+    logging.info("Starting job re-analysis")
+    reanalyze_jobs(args.db, args.workers, args.chunk_size, args.force, None if args.no_cache else args.cache)
+    logging.info("Job re-analysis completed")
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,21 @@
 import re
-import time
-import random
+import json
+import bisect
 import logging
+from collections import deque
 from urllib.parse import urljoin
 import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
+# Selenium, webdriver_manager and page_waits (which needs Selenium) are imported
+# when a browser is first needed, so HTTP-only runs start without them
+from chromedriver import chromedriver_path
+from driver_pool import WebDriverPool
+from http_cache import CachingHTTPAdapter
+from html_parsing import BASIC_INFO_BLOCKS, DETAIL_BLOCKS, LISTING_ITEMS, SCRIPTS, available_parser, parse
+from page_archive import DETAIL_HTTP, DETAIL_RENDERED, DETAIL_SECOND_TAB, LIST_PAGE
 from update_categories import determine_category
 
 # Configure logging
@@ -25,82 +28,306 @@ logging.basicConfig(
     ]
 )
 
+# Detail fetch modes: 'http' parses the page served to a plain GET request,
+# 'selenium' renders it in Chrome and 'auto' tries HTTP first
+FETCH_MODES = ('auto', 'http', 'selenium')
+
+# Section headings of job descriptions, in order of preference per section
+SECTION_KEYWORDS = {
+    'requirements': ['Prasības:', 'Prasības', 'Requirements:', 'Requirements'],
+    'responsibilities': ['Pienākumi:', 'Pienākumi', 'Darba pienākumi:', 'Tasks:', 'Responsibilities:'],
+    'benefits': ['Piedāvājums:', 'Piedāvājums', 'Piedāvājam:', 'Mēs piedāvājam:', 'We offer:', 'What we offer']
+}
+
+# Headings that only end a section
+SECTION_END_KEYWORDS = ["Atalgojums:", "Alga:", "Salary:", "Termins:", "Deadline:"]
+
+class SectionSplitter:
+    """
+    Splits a job description into sections at headings found in one scan
+
+    A section runs from the first occurrence of one of its headings
+    (case-insensitive) to the next occurrence of any other heading or the end
+    of the text; the first heading giving more than 10 characters wins. All
+    headings are compiled once into a single regex shaped like a trie, so one
+    pass over the text finds every heading position, and each section is then
+    a slice between two of them.
+    """
+
+    def __init__(self, section_keywords, end_keywords):
+        self.section_keywords = section_keywords
+        keywords = list(dict.fromkeys([kw for kws in section_keywords.values() for kw in kws] + list(end_keywords)))
+        self._keywords = []
+        self._pattern = re.compile(self._trie_pattern(keywords), re.IGNORECASE)
+        # Headings that also match where a longer one does, e.g. 'Prasības' inside 'Prasības:'
+        self._implied = [
+            frozenset(other for other in keywords
+                      if len(other) <= len(kw) and re.fullmatch(re.escape(other), kw[:len(other)], re.IGNORECASE))
+            for kw in self._keywords
+        ]
+
+    def _trie_pattern(self, keywords):
+        """
+        Regex alternation of keywords sharing their common prefixes
+
+        Each keyword ends in an empty group, so the lastindex of a match names
+        the longest keyword found at that position.
+        """
+        trie = {}
+        for kw in keywords:
+            node = trie
+            for char in kw.lower():
+                node = node.setdefault(char, {})
+            node[None] = kw
+
+        def emit(node):
+            # Groups are numbered in pattern order, so record a keyword before its longer continuations
+            group = ''
+            if None in node:
+                self._keywords.append(node[None])
+                group = '()'
+            branches = [re.escape(char) + emit(child) for char, child in node.items() if char is not None]
+            if not branches:
+                return group
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            return group + f'(?:{body})?' if group else body
+
+        return emit(trie)
+
+    def split(self, text):
+        """Return a dict of section -> text, '' for the sections without a heading"""
+        positions = []
+        headings = []
+        pos = 0
+        # Search from the character after each hit, as headings can overlap ('Darba pienākumi:')
+        while True:
+            match = self._pattern.search(text, pos)
+            if match is None:
+                break
+            positions.append(match.start())
+            headings.append(self._implied[match.lastindex - 1])
+            pos = match.start() + 1
+        
+        result = {section: '' for section in self.section_keywords}
+        for section, keywords in self.section_keywords.items():
+            for keyword in keywords:
+                start = next((i for i, found in enumerate(headings) if keyword in found), None)
+                if start is None:
+                    continue
+                # The section ends where any other heading starts
+                begin = positions[start] + len(keyword)
+                end = len(text)
+                for i in range(bisect.bisect_left(positions, begin), len(positions)):
+                    if headings[i] - {keyword}:
+                        end = positions[i]
+                        break
+                section_text = text[begin:end].strip()
+                
+                # If text is found and it's reasonable in length, save it
+                if section_text and len(section_text) > 10:
+                    result[section] = section_text
+                    break
+        return result
+
+SECTION_SPLITTER = SectionSplitter(SECTION_KEYWORDS, SECTION_END_KEYWORDS)
+
 class CVLVScraper:
-    def __init__(self, base_url, delay_range=(1, 3), headless=True):
+    def __init__(self, base_url, headless=True, fetch_mode='auto',
+                 required_fields=('description',), browsers=1, max_pages_per_browser=50,
+                 page_timeout=10, settle_timeout=2, quiet_period=0.25, parser=None, http_cache=None,
+                 archive=None, request_timeout=None):
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode: {fetch_mode}")
         self.base_url = base_url
-        self.delay_range = delay_range
+        self.headless = headless
+        self.fetch_mode = fetch_mode
+        # Details fetched over HTTP without these are loaded again with Selenium
+        self.required_fields = required_fields
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9,lv;q=0.8',
         })
+        # Optional HTTPCache that plain HTTP fetches go through
+        self.http_cache = http_cache
+        self.configure_http()
+        self.driver_pool = WebDriverPool(self._create_driver, size=browsers, max_pages=max_pages_per_browser)
+        # Seconds to wait for expected elements, for the DOM to settle, and of DOM quiet that counts as settled
+        self.page_timeout = page_timeout
+        self.settle_timeout = settle_timeout
+        self.quiet_period = quiet_period
+        # Seconds an HTTP request may wait to connect or for the next bytes of the response
+        self.request_timeout = request_timeout or page_timeout
+        # BeautifulSoup backend, see html_parsing.PARSERS
+        self.parser = parser or available_parser()
+        # (url, {wait name: seconds}) of the most recent Selenium page loads
+        self.wait_timings = deque(maxlen=1000)
+        # Optional PageArchive that every fetched page is recorded in
+        self.archive = archive
+    
+    def _create_driver(self):
+        """Start a Chrome WebDriver; called by the pool on first use, so HTTP-only runs never launch Chrome"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
         
-        # Setup Selenium WebDriver
         chrome_options = Options()
-        if headless:
+        if self.headless:
             chrome_options.add_argument("--headless")
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         
-        self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
+        return webdriver.Chrome(
+            service=Service(chromedriver_path()),
             options=chrome_options
         )
     
-    def get_page_content(self, url):
-        """Make a request to the given URL and return the BeautifulSoup object"""
+    def _page_waits(self, driver, url):
+        """PageWaits for a page just loaded in driver, recording into wait_timings"""
+        from page_waits import PageWaits
+        return PageWaits(driver, url, timeout=self.page_timeout, settle_timeout=self.settle_timeout,
+                         quiet_period=self.quiet_period, history=self.wait_timings)
+    
+    def configure_http(self, pool_size=10):
+        """Mount the transport adapter for HTTP fetches, keeping pool_size connections per host"""
+        if self.http_cache is not None:
+            adapter = CachingHTTPAdapter(self.http_cache, pool_connections=pool_size, pool_maxsize=pool_size)
+        else:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def fetch_page(self, url, raise_errors=False):
+        """Make a request to the given URL and return the response, or None on failure unless raise_errors"""
         try:
-            response = self.session.get(url)
+            response = self.session.get(url, timeout=self.request_timeout)
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            return response
         except requests.exceptions.RequestException as e:
+            if raise_errors:
+                raise
             logging.error(f"Error fetching {url}: {e}")
             return None
     
-    def get_job_listings(self, page=1):
-        """Scrape job listings from the list view page using Selenium to handle dynamic content"""
+    def _parse_content(self, url, content, content_type=None, parse_only=None):
+        # Without a charset in the Content-Type requests assumes ISO-8859-1, so let BeautifulSoup detect the encoding
+        encoding = get_encoding_from_headers({'Content-Type': content_type}) if 'charset' in (content_type or '') else None
+        return parse(content, parse_only, self.parser, label=url, from_encoding=encoding)
+    
+    def _archive_page(self, url, kind, content, content_type=None):
+        if self.archive is not None:
+            self.archive.store(url, kind, content, content_type)
+    
+    def get_page_content(self, url, parse_only=None):
+        """Make a request to the given URL and return the BeautifulSoup object"""
+        response = self.fetch_page(url)
+        if response is None:
+            return None
+        return self._parse_content(url, response.content, response.headers.get('Content-Type'), parse_only)
+    
+    def list_page_url(self, page=1):
+        """URL of the given list view page"""
         url = self.base_url
         if page > 1:
             offset = (page - 1) * 20
             url = url.replace('offset=0', f'offset={offset}')
+        return url
+    
+    def _load_list_page(self, page):
+        """Render a list view page with Selenium and return its URL and page source"""
+        url = self.list_page_url(page)
         
         logging.info(f"Loading URL in Selenium: {url}")
-        try:
-            self.driver.get(url)
-            
-            # Wait for job listings to load
-            wait = WebDriverWait(self.driver, 10)
-            wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "li.vacancies-list__item"))
-            )
-            
-            # Small additional wait to ensure all elements are loaded
-            time.sleep(2)
-            
-            # Get the page source and parse with BeautifulSoup
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            listing_items = soup.select('li.vacancies-list__item')
-            logging.info(f"Found {len(listing_items)} job listings on page {page}")
+        with self.driver_pool.driver() as driver:
+            driver.get(url)
             
-            listings = []
-            for item in listing_items:
-                try:
-                    listing_data = self._parse_listing_item(item)
-                    if listing_data:
-                        listings.append(listing_data)
-                except Exception as e:
-                    logging.error(f"Error parsing listing: {e}")
+            with self._page_waits(driver, url) as waits:
+                # Wait for job listings to load, then for the list to stop changing
+                waits.selector("li.vacancies-list__item", 'listings')
+                waits.quiet()
             
-            return listings
+            page_source = driver.page_source
+        self._archive_page(url, LIST_PAGE, page_source)
+        return url, page_source
+    
+    def get_job_listings(self, page=1, raise_errors=False):
+        """
+        Scrape job listings from the list view page using Selenium to handle dynamic content
+        
+        Errors are logged and give an empty list, unless raise_errors is set.
+        """
+        try:
+            return self.parse_job_listings(*self._load_list_page(page))
             
         except Exception as e:
+            if raise_errors:
+                raise
             logging.error(f"Error loading page with Selenium: {e}")
             return []
     
+    def iter_listings(self, start_page=1, max_pages=None):
+        """
+        Yield job listings page by page, each as soon as it is parsed
+        
+        Only one list page is held at a time, so memory stays flat however
+        many pages are crawled. Stops after max_pages pages, or at the first
+        page without listings (the end of the results, or a page that failed
+        to load).
+        
+        Args:
+            start_page (int): First list page
+            max_pages (int, optional): Maximum number of pages; all of them if not given
+        """
+        page = start_page
+        while max_pages is None or page < start_page + max_pages:
+            try:
+                url, page_source = self._load_list_page(page)
+            except Exception as e:
+                logging.error(f"Error loading page with Selenium: {e}")
+                return
+            
+            found = 0
+            for listing in self.iter_parsed_listings(url, page_source):
+                found += 1
+                yield listing
+            if not found:
+                return
+            page += 1
+    
+    def iter_details(self, listings):
+        """
+        Yield (listing, details) for each listing, fetching one detail page at a time
+        
+        listings may be any iterable, such as iter_listings(), and is consumed
+        only as fast as detail pages are fetched. See crawler.DetailFetcher for
+        concurrent fetching.
+        """
+        for listing in listings:
+            yield listing, self.get_job_details(listing['title'], listing['url'])
+    
+    def parse_job_listings(self, url, page_source):
+        """Extract the job listings from the source of a rendered list page"""
+        return list(self.iter_parsed_listings(url, page_source))
+    
+    def iter_parsed_listings(self, url, page_source):
+        """Yield the job listings of the source of a rendered list page one by one"""
+        # Parse only the listing items with BeautifulSoup
+        soup = parse(page_source, LISTING_ITEMS, self.parser, label=url)
+        
+        listing_items = soup.select('li.vacancies-list__item')
+        logging.info(f"Found {len(listing_items)} job listings on {url}")
+        
+        for item in listing_items:
+            try:
+                listing_data = self._parse_listing_item(item)
+            except Exception as e:
+                logging.error(f"Error parsing listing: {e}")
+                continue
+            if listing_data:
+                yield listing_data
+    
     def _parse_listing_item(self, item):
         """Extract data from a job listing item"""
         title_elem = item.select_one('a.vacancy-item__title')
@@ -134,146 +361,312 @@ class CVLVScraper:
         }
     
     def get_job_details(self, title, url):
-        """Scrape detailed information from a job listing page using Selenium"""
+        """
+        Scrape detailed information from a job listing page
+        
+        Depending on fetch_mode the page is parsed from a plain HTTP response,
+        rendered with Selenium, or ('auto') fetched over HTTP first and only
+        rendered with Selenium when some of the required fields are missing.
+        """
+        if self.fetch_mode == 'selenium':
+            return self.get_job_details_selenium(title, url)
+        
+        details = self.get_job_details_http(title, url)
+        if not self.needs_selenium(details, url):
+            return details
+        return self.get_job_details_selenium(title, url)
+    
+    def needs_selenium(self, details, url=None):
+        """Whether details fetched over HTTP lack required fields and fetch_mode allows a Selenium retry"""
+        if self.fetch_mode == 'http' or details.get('is_image_only'):
+            return False
+        missing = [field for field in self.required_fields if not details.get(field)]
+        if missing:
+            logging.info(f"Missing {', '.join(missing)} over HTTP, loading with Selenium: {url}")
+        return bool(missing)
+    
+    def get_job_details_http(self, title, url, raise_errors=False):
+        """
+        Scrape detailed information from the server-rendered HTML of a job listing page
+        
+        Uses the same selectors as the Selenium path, then fills in whatever
+        they did not find from the JSON state embedded in the page. A failed
+        request gives an empty dict, unless raise_errors is set.
+        """
+        logging.info(f"Fetching job details over HTTP: {url}")
+        response = self.fetch_page(url, raise_errors)
+        if response is None:
+            return {}
+        content_type = response.headers.get('Content-Type')
+        self._archive_page(url, DETAIL_HTTP, response.content, content_type)
+        return self.parse_job_details_http(title, url, response.content, content_type)
+    
+    def parse_job_details_http(self, title, url, content, content_type=None):
+        """Extract the details from the body of a job listing page fetched over HTTP"""
+        soup = self._parse_content(url, content, content_type, DETAIL_BLOCKS)
+        
+        details = {}
+        description_panel = soup.select_one('div.react-tabs__tab-panel--selected')
+        if description_panel:
+            details = self._parse_description_panel(title, url, description_panel)
+            if details.get('is_image_only'):
+                return details
+        details.update(self._parse_basic_info(soup))
+        if all(details.get(field) for field in ('description', 'salary_min', 'deadline')):
+            return details
+        
+        # The embedded JSON is only parsed when the rendered blocks lacked something
+        state = self._parse_embedded_state(self._parse_content(url, content, content_type, SCRIPTS))
+        description_element = state.pop('description', None)
+        if not details.get('description') and description_element is not None:
+            details.update(self._parse_description_panel(title, url, description_element))
+        for field, value in state.items():
+            if not details.get(field):
+                details[field] = value
+        
+        return details
+    
+    def get_job_details_selenium(self, title, url, raise_errors=False):
+        """
+        Scrape detailed information from a job listing page using Selenium
+        
+        Errors are logged and give an empty dict, unless raise_errors is set.
+        """
         try:
             logging.info(f"Loading job details from: {url}")
-            self.driver.get(url)
-            
-            # Wait for content to load
-            wait = WebDriverWait(self.driver, 10)
-            wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='tabpanel']"))
-            )
-            
-            # Small additional wait
-            time.sleep(1)
-            
-            # Get the page source and parse with BeautifulSoup
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            details = {}
-            
-            # Extract description tab content - this is the first tab panel
-            description_panel = soup.select_one('div.react-tabs__tab-panel--selected')
-            if description_panel:
-                # Check if this is an image-only listing (contains vacancy-details__image but no meaningful text)
-                image_only = False
-                image_div = description_panel.select_one('div.vacancy-details__image')
+            with self.driver_pool.driver() as driver, self._page_waits(driver, url) as waits:
+                driver.get(url)
                 
-                if image_div:
-                    # Extract all text from the description panel, excluding script tags
-                    desc_text = description_panel.get_text(strip=True)
-                    # If panel has almost no text but has an image, consider it image-only
-                    if len(desc_text) < 50:  # Very little text
-                        image_only = True
-                        logging.warning(f"Skipping image-only job listing: {url}")
-                        details['is_image_only'] = True
-                        return details
+                # Wait for content to load, then for it to stop changing
+                waits.selector("div[role='tabpanel']", 'tab panel')
+                waits.quiet()
                 
-                # Get the full description text
-                details['description'] = description_panel.text.strip()
-
-                details['job_category'] = determine_category(title, details['description'])
-            
-                # Try to extract specific sections if they exist
-                details.update(self._extract_job_sections(description_panel))
-            
-            # Extract additional info from the second tab (Pamatinformācija)
-            # Click on the second tab
-            try:
-                second_tab = self.driver.find_element(By.XPATH, "//ul[@role='tablist']/li[2]")
-                second_tab.click()
-                time.sleep(1)  # Wait for tab content to load
+                page_source = driver.page_source
+                self._archive_page(url, DETAIL_RENDERED, page_source)
+                details, soup = self._parse_rendered_details(title, url, page_source)
                 
-                # Get updated page source
-                page_source = self.driver.page_source
-                soup = BeautifulSoup(page_source, 'html.parser')
+                # Extract additional info from the second tab (Pamatinformācija), which
+                # only needs a click when the page did not already render it
+                if details.get('is_image_only') or self._has_basic_info(soup):
+                    return details
                 
-                # Extract salary and benefits
-                salary_section = soup.select_one('div.vacancy-highlights__salary')
-                if salary_section:
-                    salary_amount = salary_section.select_one('span.vacancy-highlights__salary-amount')
-                    if salary_amount:
-                        salary_text = salary_amount.text.strip()
-                        min_salary, max_salary = self._parse_salary(salary_text)
-                        if min_salary is not None:
-                            details['salary_min'] = min_salary
-                        if max_salary is not None:
-                            details['salary_max'] = max_salary
+                try:
+                    from selenium.webdriver.common.by import By
+                    second_tab = driver.find_element(By.XPATH, "//ul[@role='tablist']/li[2]")
+                    selected_panel = 'div.react-tabs__tab-panel--selected'
+                    old_text = waits.text(selected_panel)
+                    second_tab.click()
+                    # Wait for the selected panel to show the second tab's content
+                    waits.text_changed(selected_panel, old_text, 'second tab')
+                    waits.quiet('second tab quiet')
                     
-                    # Extract benefits
-                    benefits_elem = salary_section.select_one('h3')
-                    if benefits_elem and "Papildu informācija" in benefits_elem.text:
-                        benefits_text = benefits_elem.text.replace("Papildu informācija:", "").strip()
-                        details['benefits'] = benefits_text
+                    # Get updated page source
+                    tab_source = driver.page_source
+                    self._archive_page(url, DETAIL_SECOND_TAB, tab_source)
+                    details.update(self._parse_second_tab(url, tab_source))
                 
-                # Extract deadline
-                deadline_elem = soup.select_one('span.vacancy-info__deadline')
-                if deadline_elem:
-                    deadline_text = deadline_elem.text.strip()
-                    deadline_match = re.search(r'Termiņš: (\d{1,2}\.\d{1,2}\.\d{4})', deadline_text)
-                    if deadline_match:
-                        details['deadline'] = deadline_match.group(1)
-            
-            except Exception as e:
-                logging.warning(f"Could not extract data from second tab: {e}")
+                except Exception as e:
+                    logging.warning(f"Could not extract data from second tab: {e}")
             
             return details
             
         except Exception as e:
+            if raise_errors:
+                raise
             logging.error(f"Error getting job details with Selenium: {e}")
             return {}
     
-    def _extract_job_sections(self, description_element):
-        """Extract requirements, responsibilities, and benefits from the description text"""
-        result = {
-            'requirements': '',
-            'responsibilities': '',
-            'benefits': ''
-        }
+    def parse_job_details_rendered(self, title, url, page_source, tab_source=None):
+        """
+        Extract the details from the source of a rendered job listing page
         
-        # Try to find structured content first
-        section_keywords = {
-            'requirements': ['Prasības:', 'Prasības', 'Requirements:', 'Requirements'],
-            'responsibilities': ['Pienākumi:', 'Pienākumi', 'Darba pienākumi:', 'Tasks:', 'Responsibilities:'],
-            'benefits': ['Piedāvājums:', 'Piedāvājums', 'Piedāvājam:', 'Mēs piedāvājam:', 'We offer:', 'What we offer']
-        }
+        tab_source is the page source after clicking the second tab, used when
+        the first page source did not contain the basic information blocks.
+        """
+        details, soup = self._parse_rendered_details(title, url, page_source)
+        if not details.get('is_image_only') and not self._has_basic_info(soup) and tab_source:
+            details.update(self._parse_second_tab(url, tab_source))
+        return details
+    
+    def _parse_rendered_details(self, title, url, page_source):
+        """Details from the tab panels and highlight blocks of a rendered page, and the parsed blocks"""
+        soup = parse(page_source, DETAIL_BLOCKS, self.parser, label=url)
         
-        desc_text = description_element.get_text()
+        details = {}
         
-        # Look for each section in the text
-        for section, keywords in section_keywords.items():
-            for keyword in keywords:
-                pattern = f"{re.escape(keyword)}(.*?)("
-                
-                # Create a pattern that finds text between this keyword and the next section keyword
-                next_keywords = []
-                for other_keywords in section_keywords.values():
-                    next_keywords.extend(other_keywords)
-                
-                # Remove the current keyword from next_keywords
-                next_keywords = [k for k in next_keywords if k != keyword]
-                
-                # Add some common end patterns
-                next_keywords.extend(["Atalgojums:", "Alga:", "Salary:", "Termins:", "Deadline:"])
-                
-                # Create the regex pattern
-                end_pattern = "|".join(re.escape(k) for k in next_keywords)
-                if end_pattern:
-                    pattern += f"({end_pattern})|$)"
-                else:
-                    pattern += "$)"
-                
-                # Find the section text
-                match = re.search(pattern, desc_text, re.DOTALL | re.IGNORECASE)
-                if match:
-                    section_text = match.group(1).strip()
-                    
-                    # If text is found and it's reasonable in length, save it
-                    if section_text and len(section_text) > 10:
-                        result[section] = section_text
-                        break
+        # Extract description tab content - this is the first tab panel
+        description_panel = soup.select_one('div.react-tabs__tab-panel--selected')
+        if description_panel:
+            details = self._parse_description_panel(title, url, description_panel)
+            if details.get('is_image_only'):
+                return details, soup
+        
+        if self._has_basic_info(soup):
+            details.update(self._parse_basic_info(soup))
+        return details, soup
+    
+    def _has_basic_info(self, soup):
+        return soup.select_one('div.vacancy-highlights__salary, span.vacancy-info__deadline') is not None
+    
+    def _parse_second_tab(self, url, tab_source):
+        soup = parse(tab_source, BASIC_INFO_BLOCKS, self.parser, label=f"{url} (second tab)")
+        return self._parse_basic_info(soup)
+    
+    def archived_job_listings(self):
+        """Job listings of every list page in the archive, in crawl order"""
+        for page in self.archive.pages(LIST_PAGE):
+            yield from self.iter_parsed_listings(page.url, self.archive.read(page.digest).decode('utf-8'))
+    
+    def get_archived_job_details(self, title, url):
+        """
+        Rebuild the details of a job listing from its most recent archived fetch
+        
+        Returns:
+            dict: Same as get_job_details(), or None if the page was never archived
+        """
+        page = self.archive.latest(url, (DETAIL_HTTP, DETAIL_RENDERED))
+        if page is None:
+            return None
+        content = self.archive.read(page.digest)
+        if page.kind == DETAIL_HTTP:
+            return self.parse_job_details_http(title, url, content, page.content_type)
+        
+        tab_page = self.archive.latest(url, (DETAIL_SECOND_TAB,), since=page.fetched_at)
+        tab_source = self.archive.read(tab_page.digest).decode('utf-8') if tab_page else None
+        return self.parse_job_details_rendered(title, url, content.decode('utf-8'), tab_source)
+    
+    def _parse_description_panel(self, title, url, description_panel):
+        """Extract the description, category and sections from the description tab panel"""
+        details = {}
+        
+        # Check if this is an image-only listing (contains vacancy-details__image but no meaningful text)
+        image_div = description_panel.select_one('div.vacancy-details__image')
+        if image_div:
+            # Extract all text from the description panel, excluding script tags
+            desc_text = description_panel.get_text(strip=True)
+            # If panel has almost no text but has an image, consider it image-only
+            if len(desc_text) < 50:  # Very little text
+                logging.warning(f"Skipping image-only job listing: {url}")
+                details['is_image_only'] = True
+                return details
+        
+        # Get the full description text
+        details['description'] = description_panel.text.strip()
+
+        details['job_category'] = determine_category(title, details['description'])
+    
+        # Try to extract specific sections if they exist
+        details.update(self._extract_job_sections(description_panel))
+        return details
+    
+    def _parse_basic_info(self, soup):
+        """Extract salary, benefits and deadline from the basic information (Pamatinformācija) tab"""
+        details = {}
+        
+        # Extract salary and benefits
+        salary_section = soup.select_one('div.vacancy-highlights__salary')
+        if salary_section:
+            salary_amount = salary_section.select_one('span.vacancy-highlights__salary-amount')
+            if salary_amount:
+                salary_text = salary_amount.text.strip()
+                min_salary, max_salary = self._parse_salary(salary_text)
+                if min_salary is not None:
+                    details['salary_min'] = min_salary
+                if max_salary is not None:
+                    details['salary_max'] = max_salary
+            
+            # Extract benefits
+            benefits_elem = salary_section.select_one('h3')
+            if benefits_elem and "Papildu informācija" in benefits_elem.text:
+                benefits_text = benefits_elem.text.replace("Papildu informācija:", "").strip()
+                details['benefits'] = benefits_text
+        
+        # Extract deadline
+        deadline_elem = soup.select_one('span.vacancy-info__deadline')
+        if deadline_elem:
+            deadline_text = deadline_elem.text.strip()
+            deadline_match = re.search(r'Termiņš: (\d{1,2}\.\d{1,2}\.\d{4})', deadline_text)
+            if deadline_match:
+                details['deadline'] = deadline_match.group(1)
+        
+        return details
+    
+    def _parse_embedded_state(self, soup):
+        """
+        Extract vacancy fields from the JSON embedded in a server-rendered page
+        
+        Reads the schema.org JobPosting (application/ld+json) if the page has
+        one, and the salary and deadline fields of the Next.js __NEXT_DATA__
+        state. The description is returned as a BeautifulSoup element so it can
+        go through _parse_description_panel().
+        """
+        state = {}
+        
+        for script in soup.select('script[type="application/ld+json"]'):
+            try:
+                data = json.loads(script.string or '')
+            except ValueError:
+                continue
+            for item in data if isinstance(data, list) else [data]:
+                if not isinstance(item, dict) or item.get('@type') != 'JobPosting':
+                    continue
+                if item.get('description'):
+                    state['description'] = BeautifulSoup(item['description'], 'html.parser')
+                salary = item.get('baseSalary')
+                value = salary.get('value') if isinstance(salary, dict) else None
+                if isinstance(value, dict):
+                    state['salary_min'] = self._to_float(value.get('minValue', value.get('value')))
+                    state['salary_max'] = self._to_float(value.get('maxValue', value.get('value')))
+                if item.get('jobBenefits'):
+                    state['benefits'] = BeautifulSoup(item['jobBenefits'], 'html.parser').get_text('\n').strip()
+                if item.get('validThrough'):
+                    state['deadline'] = self._format_deadline(item['validThrough'])
+        
+        next_data = soup.select_one('script#__NEXT_DATA__')
+        if next_data:
+            try:
+                data = json.loads(next_data.string or '')
+            except ValueError:
+                data = None
+            for field, key in (('salary_min', 'salaryFrom'), ('salary_max', 'salaryTo'), ('deadline', 'expirationDate')):
+                value = self._find_json_value(data, key)
+                if value is not None and state.get(field) is None:
+                    state[field] = self._format_deadline(value) if field == 'deadline' else self._to_float(value)
+        
+        return {field: value for field, value in state.items() if value is not None}
+    
+    def _find_json_value(self, data, key):
+        """Depth-first search of parsed JSON for the first non-null value of key"""
+        if isinstance(data, dict):
+            if data.get(key) is not None:
+                return data[key]
+            data = data.values()
+        elif not isinstance(data, list):
+            return None
+        for child in data:
+            value = self._find_json_value(child, key)
+            if value is not None:
+                return value
+        return None
+    
+    def _to_float(self, value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    
+    def _format_deadline(self, value):
+        """Convert an ISO date (or datetime) to the DD.MM.YYYY format of the page"""
+        match = re.match(r'(\d{4})-(\d{2})-(\d{2})', str(value))
+        if not match:
+            return None
+        year, month, day = match.groups()
+        return f"{day}.{month}.{year}"
+    
+    def _extract_job_sections(self, description_element):
+        """Extract requirements, responsibilities, and benefits from the description text"""
+        # Try to find structured content first
+        result = SECTION_SPLITTER.split(description_element.get_text())
         
         # Find any bullet points in the content which might be requirements/responsibilities
         if not any(result.values()):
@@ -292,11 +685,11 @@ class CVLVScraper:
                     prev_elem = ul.find_previous()
                     if prev_elem:
                         prev_text = prev_elem.get_text().lower()
-                        if any(kw.lower() in prev_text for kw in section_keywords['requirements']):
+                        if any(kw.lower() in prev_text for kw in SECTION_KEYWORDS['requirements']):
                             result['requirements'] = '\n'.join(items)
-                        elif any(kw.lower() in prev_text for kw in section_keywords['responsibilities']):
+                        elif any(kw.lower() in prev_text for kw in SECTION_KEYWORDS['responsibilities']):
                             result['responsibilities'] = '\n'.join(items)
-                        elif any(kw.lower() in prev_text for kw in section_keywords['benefits']):
+                        elif any(kw.lower() in prev_text for kw in SECTION_KEYWORDS['benefits']):
                             result['benefits'] = '\n'.join(items)
         
         return result
@@ -320,6 +713,5 @@ class CVLVScraper:
         return None, None
     
     def close(self):
-        """Close the WebDriver"""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        """Quit all WebDrivers that were started"""
+        self.driver_pool.close()
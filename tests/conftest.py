@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules live in the repository root, next to this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
@@ -0,0 +1,22 @@
+from analyzer import ListingScores, analyze_batch, analyze_listing
+
+LISTINGS = [
+    ('Python programmētājs', 'SIA Tech', 'Strādāsi komandā pie inovatīviem projektiem, iespējams attālināts darbs.',
+     'Vismaz 3 gadu pieredze', 'Koordinēt izstrādi', 'Apmācības un karjeras izaugsme'),
+    ('Pārdevējs', None, 'Patstāvīgi apkalpot klientus veikalā, darbs maiņās.', None, None, None),
+    ('', '', '', '', '', ''),
+]
+
+def test_batch_matches_single_listings():
+    rows = analyze_batch(LISTINGS)
+
+    assert rows == [analyze_listing(*listing) for listing in LISTINGS]
+    assert all(isinstance(row, ListingScores) and len(row) == 10 for row in rows)
+
+def test_batch_scores_repeated_listings_once(monkeypatch):
+    import analyzer
+    calls = []
+    monkeypatch.setattr(analyzer, 'analyze_listing', lambda *listing: calls.append(listing) or len(calls))
+
+    assert analyzer.analyze_batch([LISTINGS[0], list(LISTINGS[1]), LISTINGS[0]]) == [1, 2, 1]
+    assert len(calls) == 2
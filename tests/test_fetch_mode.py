@@ -0,0 +1,174 @@
+import functools
+import socket
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from conftest import FIXTURES_DIR
+from crawler import DetailFetcher
+from scraper import CVLVScraper
+
+RENDERED = {'description': 'Rendered with Selenium', 'job_category': 'Vadība'}
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serves the saved pages and records every requested path"""
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope='module')
+def server():
+    handler = functools.partial(FixtureHandler, directory=FIXTURES_DIR)
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def make_scraper(server, monkeypatch):
+    """CVLVScraper for the local server whose Selenium fetch is recorded instead of starting Chrome"""
+    scrapers = []
+    FixtureHandler.requests.clear()
+
+    def make(fetch_mode):
+        scraper = CVLVScraper(f"{server}/search?limit=20&offset=0", fetch_mode=fetch_mode)
+        scraper.selenium_urls = []
+
+        def get_job_details_selenium(title, url, raise_errors=False):
+            scraper.selenium_urls.append(url)
+            return dict(RENDERED)
+
+        monkeypatch.setattr(scraper, 'get_job_details_selenium', get_job_details_selenium)
+        scrapers.append(scraper)
+        return scraper
+
+    yield make
+    for scraper in scrapers:
+        scraper.close()
+
+def test_auto_uses_server_rendered_page(server, make_scraper):
+    scraper = make_scraper('auto')
+    details = scraper.get_job_details('Python programmētājs', f"{server}/vacancy_ssr.html")
+
+    assert scraper.selenium_urls == []
+    assert FixtureHandler.requests == ['/vacancy_ssr.html']
+    assert details['description'].startswith('Mēs esam strauji augošs uzņēmums')
+    assert details['salary_min'] == 2300.0
+    assert details['salary_max'] == 3000.0
+    assert details['deadline'] == '31.12.2026'
+    assert details['benefits'] == 'Veselības apdrošināšana'
+
+def test_auto_uses_embedded_json_state(server, make_scraper):
+    scraper = make_scraper('auto')
+    details = scraper.get_job_details('Grāmatvedis', f"{server}/vacancy_json.html")
+
+    assert scraper.selenium_urls == []
+    assert details['description'].startswith('Darbs nelielā komandā')
+    assert details['requirements'] == 'Augstākā izglītība grāmatvedībā vai finansēs'
+    assert details['salary_min'] == 1800.0
+    assert details['salary_max'] == 2500.0
+    # The JobPosting is preferred over the Next.js state
+    assert details['deadline'] == '30.11.2026'
+    assert details['benefits'] == 'Veselības apdrošināšana'
+
+def test_auto_falls_back_to_selenium_without_description(server, make_scraper):
+    scraper = make_scraper('auto')
+    url = f"{server}/vacancy_shell.html"
+    details = scraper.get_job_details('Pārdevējs', url)
+
+    assert FixtureHandler.requests == ['/vacancy_shell.html']
+    assert scraper.selenium_urls == [url]
+    assert details == RENDERED
+
+def test_auto_falls_back_to_selenium_when_request_fails(server, make_scraper):
+    scraper = make_scraper('auto')
+    url = f"{server}/missing.html"
+
+    assert scraper.get_job_details('Pārdevējs', url) == RENDERED
+    assert scraper.selenium_urls == [url]
+
+def test_auto_does_not_render_image_only_listing(server, make_scraper):
+    scraper = make_scraper('auto')
+    details = scraper.get_job_details('Pārdevējs', f"{server}/vacancy_image_only.html")
+
+    assert details == {'is_image_only': True}
+    assert scraper.selenium_urls == []
+
+def test_http_mode_never_uses_selenium(server, make_scraper):
+    scraper = make_scraper('http')
+    details = scraper.get_job_details('Pārdevējs', f"{server}/vacancy_shell.html")
+
+    assert scraper.selenium_urls == []
+    assert not details.get('description')
+
+def test_selenium_mode_skips_http(server, make_scraper):
+    scraper = make_scraper('selenium')
+    url = f"{server}/vacancy_ssr.html"
+
+    assert scraper.get_job_details('Python programmētājs', url) == RENDERED
+    assert scraper.selenium_urls == [url]
+    assert FixtureHandler.requests == []
+
+@pytest.mark.parametrize('required_fields, expected_selenium', [
+    (('description',), False),
+    (('description', 'salary_min'), True),
+])
+def test_required_fields_decide_fallback(server, make_scraper, required_fields, expected_selenium):
+    scraper = make_scraper('auto')
+    scraper.required_fields = required_fields
+    url = f"{server}/vacancy_json.html"
+    details = scraper.get_job_details_http('Grāmatvedis', url)
+    # The JSON page has a salary, so drop it to see the required field decide
+    details.pop('salary_min')
+
+    assert scraper.needs_selenium(details, url) is expected_selenium
+
+def test_fetcher_auto_falls_back_to_selenium_when_request_fails(server, make_scraper):
+    scraper = make_scraper('auto')
+    fetcher = DetailFetcher(scraper, rps=1000)
+    url = f"{server}/missing.html"
+
+    assert fetcher.fetch_details({'title': 'Pārdevējs', 'url': url}) == RENDERED
+    assert FixtureHandler.requests == ['/missing.html']
+    assert scraper.selenium_urls == [url]
+
+def test_fetcher_auto_uses_server_rendered_page(server, make_scraper):
+    scraper = make_scraper('auto')
+    fetcher = DetailFetcher(scraper, rps=1000)
+    details = fetcher.fetch_details({'title': 'Python programmētājs', 'url': f"{server}/vacancy_ssr.html"})
+
+    assert scraper.selenium_urls == []
+    assert details['salary_min'] == 2300.0
+
+def test_fetcher_http_mode_raises_when_request_fails(server, make_scraper):
+    scraper = make_scraper('http')
+    fetcher = DetailFetcher(scraper, rps=1000)
+
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch_details({'title': 'Pārdevējs', 'url': f"{server}/missing.html"})
+    assert scraper.selenium_urls == []
+
+def test_stalled_request_times_out():
+    # Connections complete in the listen backlog, but nothing is ever sent back
+    with socket.socket() as stalled:
+        stalled.bind(('127.0.0.1', 0))
+        stalled.listen()
+        scraper = CVLVScraper("http://127.0.0.1/search?offset=0", fetch_mode='http', request_timeout=0.2)
+        try:
+            with pytest.raises(requests.Timeout):
+                scraper.fetch_page(f"http://127.0.0.1:{stalled.getsockname()[1]}/vacancy.html", raise_errors=True)
+        finally:
+            scraper.close()
+
+def test_unknown_fetch_mode_is_rejected():
+    with pytest.raises(ValueError):
+        CVLVScraper("http://127.0.0.1/search?offset=0", fetch_mode='browser')
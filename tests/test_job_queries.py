@@ -0,0 +1,92 @@
+import datetime
+import random
+
+import pytest
+
+from analyzer import SCORE_FIELDS
+from database import JobListing, get_engine, session_scope
+from job_queries import explain_query_plan, find_jobs, job_query, plan_checks, plan_problems
+
+CATEGORIES = ['IT', 'Vadība', 'Tirdzniecība', None]
+
+@pytest.fixture(scope='module')
+def db_path(tmp_path_factory):
+    """Database of seeded random listings, with shared scraped_at values and missing salaries and dates"""
+    path = str(tmp_path_factory.mktemp('db') / 'jobs.db')
+    get_engine(path)
+    rng = random.Random(7)
+    start = datetime.datetime(2026, 1, 1)
+    with session_scope(path) as session:
+        for number in range(500):
+            salary_min = rng.choice([None, rng.randrange(600, 4000)])
+            job = JobListing(
+                title=f"Job {number}", url=f"https://cv.lv/lv/vacancy/{number}",
+                job_category=rng.choice(CATEGORIES),
+                salary_min=salary_min,
+                salary_max=salary_min and salary_min + rng.randrange(0, 1500),
+                # Few distinct dates, so pages often end in the middle of jobs with the same one
+                scraped_at=rng.choice([None] + [start + datetime.timedelta(hours=hour) for hour in range(60)]),
+                **{field: rng.random() for field in SCORE_FIELDS},
+            )
+            session.add(job)
+    return path
+
+def expected_ids(session, category=None, salary_from=None, salary_to=None, min_scores=None):
+    """find_jobs() result ids computed in Python over every row"""
+    jobs = [
+        job for job in session.query(JobListing)
+        if job.scraped_at is not None
+        and (category is None or job.job_category == category)
+        and (salary_from is None or (job.salary_max is not None and job.salary_max >= salary_from))
+        and (salary_to is None or (job.salary_min is not None and job.salary_min <= salary_to))
+        and all(getattr(job, field) >= value for field, value in (min_scores or {}).items())
+    ]
+    return [job.id for job in sorted(jobs, key=lambda job: (job.scraped_at, job.id), reverse=True)]
+
+@pytest.mark.parametrize('filters', plan_checks(), ids=repr)
+def test_common_queries_read_an_index_range(db_path, filters):
+    with session_scope(db_path) as session:
+        plan = explain_query_plan(session, job_query(session, **filters).limit(21))
+
+    assert plan_problems(plan) == []
+    assert plan[0].startswith('SEARCH job_listings USING INDEX')
+
+def test_plan_problems_flag_full_scans():
+    assert plan_problems(['SCAN job_listings']) == ['SCAN job_listings']
+    assert plan_problems(['SCAN job_listings USING INDEX ix_job_listings_scraped_at']) == [
+        'SCAN job_listings USING INDEX ix_job_listings_scraped_at']
+    assert plan_problems(['SEARCH job_listings USING INDEX ix_job_listings_salary_max (salary_max>?)',
+                          'USE TEMP B-TREE FOR ORDER BY']) == []
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'category': 'IT'},
+    {'category': 'IT', 'salary_from': 1500, 'salary_to': 3000},
+    {'salary_from': 1500},
+    {'salary_to': 3000, 'min_scores': {'learning_opportunity': 0.3}},
+    # Not indexed, so filtered while reading the scraped_at index
+    {'min_scores': {'stress_level': 0.5}},
+], ids=repr)
+def test_pages_return_every_job_once(db_path, filters):
+    with session_scope(db_path) as session:
+        ids, cursor = [], None
+        while True:
+            page = find_jobs(session, limit=17, after=cursor, **filters)
+            assert len(page.jobs) <= 17
+            ids += [job.id for job in page.jobs]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        expected = expected_ids(session, **filters)
+
+    assert len(ids) == len(set(ids))
+    assert ids == expected
+    assert expected
+
+def test_last_full_page_has_no_cursor(db_path):
+    with session_scope(db_path) as session:
+        total = len(expected_ids(session, category='IT'))
+        page = find_jobs(session, category='IT', limit=total)
+
+    assert len(page.jobs) == total
+    assert page.next_cursor is None
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from database import JobListing, JobWriter, get_engine, session_scope
+
+def make_job(number):
+    return JobListing(title=f"Job {number}", url=f"https://cv.lv/lv/vacancy/{number}")
+
+def stored_urls(db_path):
+    with session_scope(db_path) as session:
+        return {url for url, in session.query(JobListing.url)}
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    get_engine(path)
+    return path
+
+def test_timer_writes_a_lone_job(db_path):
+    flushed = threading.Event()
+    with JobWriter(get_engine(db_path), batch_size=50, flush_interval=0.1,
+                   on_flush=lambda jobs: flushed.set()) as writer:
+        writer.add(make_job(1))
+        # No further add() or close(): only the timer can write it
+        assert flushed.wait(5)
+        assert stored_urls(db_path) == {make_job(1).url}
+
+def test_full_batch_is_written_at_once(db_path):
+    with JobWriter(get_engine(db_path), batch_size=2, flush_interval=None) as writer:
+        writer.add(make_job(1))
+        assert stored_urls(db_path) == set()
+        writer.add(make_job(2))
+        assert writer.inserted == 2
+        assert len(stored_urls(db_path)) == 2
+
+def test_known_jobs_are_skipped(db_path):
+    inserted, skipped = [], []
+    with JobWriter(get_engine(db_path), flush_interval=None,
+                   on_flush=inserted.extend, on_skip=skipped.extend) as writer:
+        writer.add(make_job(1))
+        writer.flush()
+        writer.add(make_job(1))
+        writer.add(make_job(2))
+
+    assert [job.title for job in inserted] == ['Job 1', 'Job 2']
+    assert [job.title for job in skipped] == ['Job 1']
+    assert (writer.inserted, writer.skipped) == (2, 1)
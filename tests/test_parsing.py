@@ -0,0 +1,88 @@
+import json
+import os
+import re
+
+import pytest
+
+from conftest import FIXTURES_DIR
+from html_parsing import PARSERS
+from scraper import CVLVScraper, SECTION_END_KEYWORDS, SECTION_KEYWORDS, SECTION_SPLITTER
+
+# Expected details of each fixture page. The rendered and server-rendered pages were
+# recorded with the Selenium code path of the original scraper (a single html.parser
+# parse of the whole page per tab, and one regex per section heading); the JSON-only
+# page has no counterpart there.
+with open(os.path.join(FIXTURES_DIR, 'expected_details.json'), encoding='utf-8') as f:
+    EXPECTED = json.load(f)
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+def reference_sections(text):
+    """The section extraction of the original scraper: one regex search per heading"""
+    result = {'requirements': '', 'responsibilities': '', 'benefits': ''}
+    for section, keywords in SECTION_KEYWORDS.items():
+        for keyword in keywords:
+            next_keywords = [k for keywords in SECTION_KEYWORDS.values() for k in keywords if k != keyword]
+            next_keywords.extend(SECTION_END_KEYWORDS)
+            end_pattern = "|".join(re.escape(k) for k in next_keywords)
+            pattern = f"{re.escape(keyword)}(.*?)(({end_pattern})|$)"
+            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+            if match:
+                section_text = match.group(1).strip()
+                if section_text and len(section_text) > 10:
+                    result[section] = section_text
+                    break
+    return result
+
+@pytest.fixture(params=PARSERS)
+def scraper(request):
+    if request.param == 'lxml':
+        pytest.importorskip('lxml')
+    scraper = CVLVScraper("https://cv.lv/lv/search?limit=20&offset=0", parser=request.param)
+    yield scraper
+    scraper.close()
+
+@pytest.mark.parametrize('name', sorted(EXPECTED))
+def test_parse_job_details(scraper, name):
+    fixture = EXPECTED[name]
+    url = f"https://cv.lv/lv/vacancy/{name}"
+    page = read_fixture(fixture['page'])
+    if fixture['fetched'] == 'http':
+        details = scraper.parse_job_details_http(fixture['title'], url, page, 'text/html; charset=utf-8')
+    else:
+        tab_page = read_fixture(fixture['tab_page']).decode('utf-8') if 'tab_page' in fixture else None
+        details = scraper.parse_job_details_rendered(fixture['title'], url, page.decode('utf-8'), tab_page)
+
+    assert details == fixture['details']
+
+def test_parse_job_details_detects_encoding_without_charset(scraper):
+    fixture = EXPECTED['vacancy_ssr']
+    details = scraper.parse_job_details_http(fixture['title'], 'https://cv.lv/lv/vacancy/1',
+                                             read_fixture(fixture['page']), 'text/html')
+
+    assert details == fixture['details']
+
+@pytest.mark.parametrize('name', sorted(EXPECTED))
+def test_section_splitter_matches_reference_on_fixtures(name):
+    description = EXPECTED[name]['details'].get('description')
+    if description is None:
+        pytest.skip('no description')
+
+    assert SECTION_SPLITTER.split(description) == reference_sections(description)
+
+@pytest.mark.parametrize('text', [
+    "",
+    "Darbs komandā bez virsrakstiem.",
+    "PRASĪBAS: pieredze ar Python un SQL\nPIENĀKUMI: uzturēt servisus un datubāzes",
+    "Prasības: īss\nPrasības: otrajā vietā ir garāks teksts",
+    "Prasības: pieredze darbā ar klientiem Atalgojums: 1500 EUR",
+    "Darba pienākumi: vadīt noliktavas komandu\nPienākumi: atskaites",
+    "Requirements Good English and Java\nWhat we offer remote work and training\nDeadline: 01.12.2026",
+    "Mēs piedāvājam: veselības apdrošināšanu\nPiedāvājam: elastīgu grafiku un apmācības",
+    "Tasks: writing code and reviewing it\nResponsibilities: shorter\nSalary: 3000",
+    "Prasības:\n\n\nPienākumi:\n\nPiedāvājums:",
+])
+def test_section_splitter_matches_reference(text):
+    assert SECTION_SPLITTER.split(text) == reference_sections(text)
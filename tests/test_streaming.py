@@ -0,0 +1,100 @@
+import itertools
+import os
+
+import pytest
+import requests
+
+from conftest import FIXTURES_DIR
+from html_parsing import PARSERS
+from scraper import CVLVScraper
+
+LIST_PAGES = {1: 'list_page1.html', 2: 'list_page2.html', 3: 'list_page_empty.html'}
+DETAIL_PAGES = ['vacancy_ssr.html', 'vacancy_json.html', 'vacancy_image_only.html', 'vacancy_shell.html']
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+def fixture_response(url, name):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response._content = read_fixture(name)
+    response.url = url
+    return response
+
+@pytest.fixture(params=PARSERS)
+def scraper(request, monkeypatch):
+    """HTTP-only CVLVScraper whose list pages and detail responses come from the fixtures"""
+    if request.param == 'lxml':
+        pytest.importorskip('lxml')
+    scraper = CVLVScraper("https://cv.lv/lv/search?limit=20&offset=0", fetch_mode='http', parser=request.param)
+    scraper.loaded_pages = []
+
+    def load_list_page(page):
+        scraper.loaded_pages.append(page)
+        return scraper.list_page_url(page), read_fixture(LIST_PAGES[page]).decode('utf-8')
+
+    monkeypatch.setattr(scraper, '_load_list_page', load_list_page)
+    monkeypatch.setattr(scraper, 'fetch_page',
+                        lambda url, raise_errors=False: fixture_response(url, url.rsplit('/', 1)[-1]))
+    yield scraper
+    scraper.close()
+
+def parsed_list_page(scraper, page):
+    return scraper.parse_job_listings(scraper.list_page_url(page), read_fixture(LIST_PAGES[page]).decode('utf-8'))
+
+def test_iter_listings_matches_parse_job_listings(scraper):
+    listings = list(scraper.iter_listings())
+
+    assert listings == parsed_list_page(scraper, 1) + parsed_list_page(scraper, 2)
+    assert len(listings) == 5
+    # Stopped at the first page without listings
+    assert scraper.loaded_pages == [1, 2, 3]
+
+def test_iter_listings_loads_pages_lazily(scraper):
+    listings = scraper.iter_listings()
+    first = list(itertools.islice(listings, 3))
+
+    assert first == parsed_list_page(scraper, 1)
+    assert scraper.loaded_pages == [1]
+    assert next(listings) == parsed_list_page(scraper, 2)[0]
+    assert scraper.loaded_pages == [1, 2]
+
+def test_iter_listings_stops_after_max_pages(scraper):
+    listings = list(scraper.iter_listings(start_page=2, max_pages=1))
+
+    assert listings == parsed_list_page(scraper, 2)
+    assert scraper.loaded_pages == [2]
+
+def test_iter_listings_stops_when_a_page_fails(scraper, monkeypatch):
+    def load_list_page(page):
+        raise TimeoutError(f"page {page} did not load")
+
+    monkeypatch.setattr(scraper, '_load_list_page', load_list_page)
+
+    assert list(scraper.iter_listings()) == []
+
+def test_iter_details_matches_parse_job_details_http(scraper):
+    listings = [{'title': name, 'url': f"https://cv.lv/lv/vacancy/{name}"} for name in DETAIL_PAGES]
+    results = list(scraper.iter_details(listings))
+
+    assert [listing for listing, _ in results] == listings
+    for listing, details in results:
+        name = listing['title']
+        expected = scraper.parse_job_details_http(name, listing['url'], read_fixture(name), 'text/html; charset=utf-8')
+        assert details == expected
+    assert results[0][1]['salary_min'] == 2300.0
+
+def test_iter_details_consumes_listings_lazily(scraper):
+    consumed = []
+
+    def listings():
+        for name in DETAIL_PAGES:
+            consumed.append(name)
+            yield {'title': name, 'url': f"https://cv.lv/lv/vacancy/{name}"}
+
+    details = scraper.iter_details(listings())
+    next(details)
+
+    assert consumed == DETAIL_PAGES[:1]
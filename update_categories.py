@@ -64,6 +64,68 @@ CATEGORY_KEYWORDS = {
     "Veselības aprūpe, Farmācija": ["veselīb", "medicīn", "ārsts", "farmāc", "health", "medical", "nurse", "doctor", "pharmacy"]
 }
 
+# Version of the category rules. Bump it whenever JOB_CATEGORIES, CATEGORY_KEYWORDS
+# or the classification rules change, so stored categories are recomputed
+RULES_VERSION = 1
+
+# Version stored next to a job_category
+CATEGORY_VERSION = f"rules-{RULES_VERSION}"
+
+class CategoryClassifier:
+    """
+    Category keywords compiled once into a single keyword table.
+
+    Every distinct keyword is checked once per listing, against the lowercased
+    title and then the lowercased title + description, and its points go to
+    all categories that list it. This gives the same scores as checking each
+    category's keywords separately.
+    """
+
+    def __init__(self, category_keywords):
+        self.categories = list(category_keywords)
+        keyword_categories = {}
+        for index, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                keyword_categories.setdefault(keyword.lower(), []).append(index)
+        self.keywords = list(keyword_categories.items())
+
+    def scores(self, title, description=None):
+        """Return the score of every category, in category order"""
+        title = title.lower()
+        text = title
+        if description:
+            text += " " + description.lower()
+
+        scores = [0] * len(self.categories)
+        for keyword, indexes in self.keywords:
+            # Give more weight to matches in the title
+            if keyword in title:
+                points = 2
+            elif keyword in text:
+                points = 1
+            else:
+                continue
+            for index in indexes:
+                scores[index] += points
+        return scores
+
+    def classify(self, title, description=None):
+        """Return the best matching category, or "Unknown" if no keyword matches"""
+        if not title:
+            return "Unknown"
+
+        scores = self.scores(title, description)
+        best_score = max(scores)
+        if best_score == 0:
+            return "Unknown"
+        return self.categories[scores.index(best_score)]
+
+    def classify_batch(self, listings):
+        """Return the best matching category for every (title, description) pair"""
+        return [self.classify(title, description) for title, description in listings]
+
+_CLASSIFIER = CategoryClassifier(CATEGORY_KEYWORDS)
+
 def determine_category(title, description=None):
     """
     Determine the most appropriate job category based on title and description
@@ -75,35 +137,19 @@ def determine_category(title, description=None):
     Returns:
         str: The best matching job category
     """
-    if not title:
-        return "Unknown"
-    
-    # Combine title and description for matching
-    text = title.lower()
-    if description:
-        text += " " + description.lower()
-    
-    # Count matches for each category
-    category_scores = {}
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        score = 0
-        for keyword in keywords:
-            if keyword.lower() in text:
-                # Give more weight to matches in the title
-                if keyword.lower() in title.lower():
-                    score += 2
-                else:
-                    score += 1
-        category_scores[category] = score
-    
-    # Get category with highest score
-    best_category = max(category_scores.items(), key=lambda x: x[1])
+    return _CLASSIFIER.classify(title, description)
+
+def determine_categories(listings):
+    """
+    Determine the job category of many listings at once
     
-    # If no matches found, return Unknown
-    if best_category[1] == 0:
-        return "Unknown"
+    Args:
+        listings (iterable): (title, description) pairs
     
-    return best_category[0]
+    Returns:
+        list: The best matching job category of each listing
+    """
+    return _CLASSIFIER.classify_batch(listings)
 
 def extract_category_from_url(url):
     """Extract category from CV.lv URL if possible"""
@@ -162,52 +208,57 @@ def add_column_if_not_exists(cursor, table_name, column_name, column_type):
 
 def update_job_categories(db_path):
     """
-    Update job categories in the database for jobs with missing or unknown categories
+    Update job categories in the database for jobs not yet checked by the current category rules
+
+    Jobs whose text changed are included too: reanalyze.py clears their
+    category_version when it sees a new content hash.
     
     Args:
         db_path (str): Path to SQLite database
     """
-    conn = None
+    # SQLAlchemy is only loaded here, so importing determine_category stays cheap
+    from sqlalchemy import text
+    from sqlalchemy.exc import SQLAlchemyError
+    from database import get_engine
+    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Add job_category column if it doesn't exist
-        add_column_if_not_exists(cursor, "job_listings", "job_category", "VARCHAR(100)")
-        
-        # Get jobs with missing or unknown categories
-        cursor.execute("""
-            SELECT id, title, description, url, job_category 
-            FROM job_listings 
-            WHERE job_category IS NULL OR job_category = 'Unknown'
-        """)
-        jobs = cursor.fetchall()
-        
-        updated_count = 0
-        for job_id, title, description, url, current_category in jobs:
-            # Try to extract from URL first
-            category = extract_category_from_url(url)
+        # The engine adds the job_category and category_version columns if they don't exist
+        with get_engine(db_path).begin() as conn:
+            # Get jobs categorized by other rules, or never categorized at all
+            jobs = conn.execute(text("""
+                SELECT id, title, description, url, job_category 
+                FROM job_listings 
+                WHERE category_version IS NOT :version
+            """), {'version': CATEGORY_VERSION}).fetchall()
             
-            # If not found in URL, determine from content
-            if not category:
-                category = determine_category(title, description)
+            # Try to extract from URL first, otherwise determine from content
+            categories = [extract_category_from_url(url) for _, _, _, url, _ in jobs]
+            content_indexes = [i for i, category in enumerate(categories) if not category]
+            content_categories = determine_categories((jobs[i][1], jobs[i][2]) for i in content_indexes)
+            for i, category in zip(content_indexes, content_categories):
+                categories[i] = category
             
-            # If a valid category was determined, update the database
-            if category != "Unknown":
-                cursor.execute(
-                    "UPDATE job_listings SET job_category = ? WHERE id = ?",
-                    (category, job_id)
-                )
-                updated_count += 1
+            updated_count = 0
+            updates = []
+            for (job_id, _, _, _, current_category), category in zip(jobs, categories):
+                # Only a valid category replaces the stored one, but every checked job is stamped
+                if category != "Unknown" and category != current_category:
+                    updated_count += 1
+                updates.append({
+                    'category': category if category != "Unknown" else None,
+                    'version': CATEGORY_VERSION,
+                    'id': job_id,
+                })
+            if updates:
+                conn.execute(text(
+                    "UPDATE job_listings SET job_category = COALESCE(:category, job_category), "
+                    "category_version = :version WHERE id = :id"
+                ), updates)
         
-        conn.commit()
-        logging.info(f"Updated {updated_count} job categories out of {len(jobs)} total jobs with missing categories")
+        logging.info(f"Updated {updated_count} job categories out of {len(jobs)} jobs checked with category rules {CATEGORY_VERSION}")
     
-    except sqlite3.Error as e:
+    except SQLAlchemyError as e:
         logging.error(f"Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Update job categories in the database')